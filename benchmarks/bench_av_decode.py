@@ -0,0 +1,62 @@
+"""
+Benchmark Alpha Vantage TIME_SERIES_DAILY decoding: the old DataFrame.from_dict path vs.
+data_fetcher.decode_av_daily, on a synthetic 20-year payload.
+
+    python benchmarks/bench_av_decode.py
+"""
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules import data_fetcher
+
+
+def make_payload(n_bars=5200, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=datetime.now(), periods=n_bars)[::-1]
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    return {'Time Series (Daily)': {
+        d.strftime('%Y-%m-%d'): {
+            '1. open': f"{c * 0.99:.4f}",
+            '2. high': f"{c * 1.01:.4f}",
+            '3. low': f"{c * 0.98:.4f}",
+            '4. close': f"{c:.4f}",
+            '5. volume': str(int(v)),
+        }
+        for d, c, v in zip(dates, close, rng.integers(10**5, 10**8, n_bars))
+    }}
+
+
+def legacy_decode(data, start_date):
+    df = pd.DataFrame.from_dict(data['Time Series (Daily)'], orient='index')
+    df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+    df = df.astype(float)
+    df.index = pd.to_datetime(df.index)
+    df = df.sort_index().reset_index().rename(columns={'index': 'Date'})
+    return df[df['Date'] >= start_date]
+
+
+def fast_decode(data, start_date):
+    return data_fetcher._av_frame(data_fetcher.decode_av_daily(data, start_date), start_date)
+
+
+def main():
+    data = make_payload()
+    for period in ('1mo', '1y', '5y', 'max'):
+        days = data_fetcher.get_period_days(period) if period != 'max' else 365 * 30
+        start_date = datetime.now() - timedelta(days=days)
+        old = legacy_decode(data, start_date)
+        new = fast_decode(data, start_date)
+        assert np.allclose(old['Close'].to_numpy(), new['Close'].to_numpy())
+        t_old = min(timeit.repeat(lambda: legacy_decode(data, start_date), number=10, repeat=3)) / 10
+        t_new = min(timeit.repeat(lambda: fast_decode(data, start_date), number=10, repeat=3)) / 10
+        print(f"{period:>4}: {len(new):5d} bars  legacy {t_old * 1000:7.2f} ms  fast {t_new * 1000:7.2f} ms  x{t_old / t_new:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark the NumPy indicator kernels in processing (EMA, MACD, Bollinger, ATR, OBV, VWAP)
+against the equivalent pandas expressions at 10k, 100k and 1M bars.
+
+    python benchmarks/bench_indicators.py
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules import data_fetcher, processing
+
+
+def pandas_atr(df, window=14):
+    prev_close = df['Close'].shift()
+    tr = pd.concat([df['High'] - df['Low'], (df['High'] - prev_close).abs(), (df['Low'] - prev_close).abs()], axis=1).max(axis=1)
+    atr = tr.ewm(alpha=1.0 / window, adjust=False).mean()
+    return atr
+
+
+def pandas_vwap(df, window=20):
+    typical = (df['High'] + df['Low'] + df['Close']) / 3
+    return (typical * df['Volume']).rolling(window).sum() / df['Volume'].rolling(window).sum()
+
+
+INDICATORS = {
+    'EMA_12': (
+        lambda df: processing.ema_kernel(df['Close'].to_numpy(), 2.0 / 13),
+        lambda df: df['Close'].ewm(span=12, adjust=False).mean(),
+    ),
+    'MACD': (
+        lambda df: processing.macd_kernel(df['Close'].to_numpy()),
+        lambda df: df['Close'].ewm(span=12, adjust=False).mean() - df['Close'].ewm(span=26, adjust=False).mean(),
+    ),
+    'Bollinger': (
+        lambda df: processing.bollinger_std_kernel(df['Close'].to_numpy()),
+        lambda df: df['Close'].rolling(20).std(ddof=0),
+    ),
+    'ATR': (
+        lambda df: processing.atr_kernel(df['High'].to_numpy(), df['Low'].to_numpy(), df['Close'].to_numpy()),
+        pandas_atr,
+    ),
+    'OBV': (
+        lambda df: processing.obv_kernel(df['Close'].to_numpy(), df['Volume'].to_numpy()),
+        lambda df: (np.sign(df['Close'].diff()).fillna(0) * df['Volume']).cumsum(),
+    ),
+    'VWAP': (
+        lambda df: processing.vwap_kernel(df['High'].to_numpy(), df['Low'].to_numpy(), df['Close'].to_numpy(), df['Volume'].to_numpy()),
+        pandas_vwap,
+    ),
+}
+
+
+def best_of(func, df, number):
+    return min(timeit.repeat(lambda: func(df), number=number, repeat=3)) / number
+
+
+def main():
+    for n_bars in (10_000, 100_000, 1_000_000):
+        df = data_fetcher.generate_ohlcv(n_bars, 1000.0, seed=0)
+        number = max(1, 1_000_000 // n_bars)
+        print(f"{n_bars:,} bars")
+        for name, (kernel, reference) in INDICATORS.items():
+            t_kernel = best_of(kernel, df, number)
+            t_pandas = best_of(reference, df, number)
+            print(f"  {name:>9}: numpy {t_kernel * 1000:8.2f} ms  pandas {t_pandas * 1000:8.2f} ms  x{t_pandas / t_kernel:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,155 @@
+import os
 import streamlit as st
 
 # Caching TTL in seconds
 CACHE_TTL = 300
 
+# Local on-disk OHLCV store (one Parquet file per ticker)
+DATA_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "store")
+
+# Number of symbols requested per grouped yfinance download
+BATCH_DOWNLOAD_SIZE = 10
+
+# How load_stock_data_auto queries the network sources:
+#   "sequential" - yfinance, then Alpha Vantage
+#   "hedged"     - start the fallback if the primary has not answered after FETCH_HEDGE_DELAY
+#   "parallel"   - start every source at once
+FETCH_MODE = "hedged"
+FETCH_HEDGE_DELAY = 3.0
+# Overall time budget (seconds) for the hedged/parallel modes
+FETCH_DEADLINE = 20.0
+
+# Alpha Vantage plan limits, shared by every session in the process
+AV_REQUESTS_PER_MINUTE = 5
+AV_BURST = 5
+# Longest a caller will queue for a rate-limit slot before giving up (seconds)
+AV_MAX_WAIT = 15.0
+
+# Shared HTTP client: (connect, read) timeouts per source, pool size and retry policy
+HTTP_TIMEOUTS = {
+    "alpha_vantage": (5, 30),
+    "yfinance": 15,
+}
+HTTP_POOL_MAXSIZE = 10
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+
+# Tickers loaded at once by the async load_many API
+ASYNC_MAX_CONCURRENCY = 16
+
+# Exchange sessions (local time zone, regular open and close) used to schedule refreshes and key caches
+MARKET_SESSIONS = {
+    "US": {"tz": "America/New_York", "open": (9, 30), "close": (16, 0)},
+    "NSE": {"tz": "Asia/Kolkata", "open": (9, 15), "close": (15, 30)},
+}
+# Full-day exchange holidays (YYYY-MM-DD); extend these as the exchanges publish their calendars
+# (a warning is printed when a market's list has no dates for the year being checked)
+MARKET_HOLIDAYS = {
+    "US": [
+        "2025-01-01", "2025-01-09", "2025-01-20", "2025-02-17", "2025-04-18", "2025-05-26",
+        "2025-06-19", "2025-07-04", "2025-09-01", "2025-11-27", "2025-12-25",
+        "2026-01-01", "2026-01-19", "2026-02-16", "2026-04-03", "2026-05-25", "2026-06-19",
+        "2026-07-03", "2026-09-07", "2026-11-26", "2026-12-25",
+    ],
+    "NSE": [
+        "2025-02-26", "2025-03-14", "2025-03-31", "2025-04-10", "2025-04-14", "2025-04-18",
+        "2025-05-01", "2025-08-15", "2025-08-27", "2025-10-02", "2025-10-21", "2025-10-22",
+        "2025-11-05", "2025-12-25",
+        "2026-01-26", "2026-03-03", "2026-03-26", "2026-03-31", "2026-04-03", "2026-04-14",
+        "2026-05-01", "2026-05-28", "2026-06-26", "2026-09-14", "2026-10-02", "2026-10-20",
+        "2026-11-10", "2026-11-24", "2026-12-25",
+    ],
+}
+
+# Background prefetch: keeps RELIABLE_TICKERS plus PREFETCH_WATCHLIST warm in the local store
+PREFETCH_ENABLED = True
+PREFETCH_WATCHLIST = []
+PREFETCH_PERIOD = "5y"
+# Refresh every PREFETCH_AGGRESSIVE_INTERVAL seconds for PREFETCH_AFTER_CLOSE_WINDOW seconds
+# after each market's close, and every PREFETCH_IDLE_INTERVAL seconds otherwise
+PREFETCH_AGGRESSIVE_INTERVAL = 10 * 60
+PREFETCH_AFTER_CLOSE_WINDOW = 2 * 60 * 60
+PREFETCH_IDLE_INTERVAL = 60 * 60
+
+# Loaded frames kept for the rest of their trading session (least recently used dropped first)
+SESSION_CACHE_SIZE = 64
+# Indicator registry: how many (ticker, data version) sets of computed columns to memoize
+INDICATOR_MEMO_SIZE = 64
+# Store processed frames with float32 prices (when that keeps their 2-decimal values), integer
+# volume and Close_Lag_* views; computed indicators stay float64
+COMPACT_FRAMES = True
+
+# Ticker metadata catalog (symbol,name,exchange,currency,sector,industry CSV). Point this at a
+# full exchange listing export to cover more symbols than the bundled file.
+TICKER_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "tickers.csv")
+
+# Trained-model registry: one joblib file per (ticker, feature-matrix hash, hyperparameter hash),
+# loaded with memory-mapped arrays; MODEL_MEMO_SIZE loaded models are also kept in memory
+MODEL_REGISTRY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "models")
+MODEL_MEMO_SIZE = 16
+# Stored data versions kept per ticker and model kind (hyperparameter hash: the price model and
+# each forecast horizon prune separately), and the cap on files per ticker across kinds, which
+# never removes the newest entry of a kind
+MODEL_REGISTRY_KEEP = 5
+MODEL_REGISTRY_MAX_PER_TICKER = 40
+
+# Also feed processing.EXTENDED_INDICATORS (EMA/MACD/Bollinger/ATR/OBV/VWAP) to the price model.
+# Off by default: the ten extra columns make the 5y fit about 40% slower (1.5s -> 2.15s)
+MODEL_EXTENDED_FEATURES = False
+
+# Incremental model updates: when bars are appended to a ticker's registered data, grow the
+# forest by MODEL_UPDATE_TREES trees fitted on the last MODEL_UPDATE_WINDOW rows and retire as
+# many old ones ("oldest" first, or the "worst" on recent bars). A full retrain happens instead
+# after MODEL_MAX_UPDATES updates, or when the model's RMSE on the new bars exceeds
+# MODEL_DRIFT_TOLERANCE x its held-out test RMSE.
+MODEL_INCREMENTAL = True
+MODEL_UPDATE_TREES = 10
+MODEL_UPDATE_WINDOW = 250
+MODEL_RETIRE_POLICY = "oldest"
+MODEL_MAX_UPDATES = 20
+MODEL_DRIFT_TOLERANCE = 2.0
+
+# Start method for process pools (backtest, batch training). Forking the multi-threaded
+# Streamlit server can deadlock children on locks held by other threads, so pools start
+# workers from a clean forkserver process ("spawn" also works)
+PROCESS_POOL_START_METHOD = "forkserver"
+
+# Walk-forward backtest: training rows per fold (at most BACKTEST_MIN_TRAIN, at least half the
+# data), minimum test rows per fold (so per-fold R² is defined) and pool size (None = CPU count)
+BACKTEST_MIN_TRAIN = 250
+BACKTEST_MIN_TEST = 5
+BACKTEST_WORKERS = None
+# Per-fold models are lighter than MODEL_PARAMS (about 0.1s per fold on 5y of bars instead of
+# 1.1s). BACKTEST_REFIT_EVERY > 1 refits from scratch only every that many folds; in between,
+# BACKTEST_UPDATE_TREES trees fitted on the latest rows replace the oldest ones, as
+# model.update_model does when bars arrive. That is several times faster again, but the
+# older trees have not seen the most recent rows, which costs accuracy on trending series.
+BACKTEST_MODEL_PARAMS = {'n_estimators': 20, 'max_depth': 8, 'max_features': 0.33}
+BACKTEST_REFIT_EVERY = 1
+BACKTEST_UPDATE_TREES = 3
+
+# Universe-wide batch training (modules/training.py): period matching the app's default, pool
+# size (None = CPU count) and forest n_jobs per worker (None = the CPUs left per worker).
+# PREFETCH_TRAIN_MODELS retrains each market's tickers after the prefetcher refreshes them.
+BATCH_TRAIN_PERIOD = "1y"
+BATCH_TRAIN_WORKERS = None
+BATCH_TRAIN_N_JOBS = None
+PREFETCH_TRAIN_MODELS = False
+
 # API Keys (You should store these in st.secrets)
 # ALPHA_VANTAGE_API_KEY = st.secrets["ALPHA_VANTAGE_API_KEY"]
 # FINNHUB_API_KEY = st.secrets["FINNHUB_API_KEY"] # Placeholder for your Finnhub key
 
-# Enhanced stock tickers
+# Stock picker universe per market (also what the prefetcher keeps warm). Names, exchanges and
+# currencies come from the ticker catalog (TICKER_CATALOG_PATH), so every symbol here must be in it
 RELIABLE_TICKERS = {
-    "US Markets": {
-        "AAPL": "Apple Inc.",
-        "GOOGL": "Alphabet Inc.",
-        "MSFT": "Microsoft Corporation",
-        "BLK": "BlackRock Inc.",
-        "GS": "Goldman Sachs Group Inc.",
-        "STT": "State Street Corporation",
-        "TSLA": "Tesla Inc.",
-        "AMZN": "Amazon.com Inc.",
-        "NVDA": "NVIDIA Corporation",
-        "META": "Meta Platforms Inc.",
-        "NFLX": "Netflix Inc.",
-        "JPM": "JPMorgan Chase & Co.",
-        "V": "Visa Inc."
-    },
-    "Indian Markets": {
-        "RELIANCE.NSE": "Reliance Industries",
-        "TCS.NSE": "Tata Consultancy Services",
-        "PARAS.NSE": "Paras Defence and Space Technologies",
-        "INFY.NSE": "Infosys Limited",
-        "HDFCBANK.NSE": "HDFC Bank",
-        "WIPRO.NSE": "Wipro Limited",
-        "ITC.NSE": "ITC Limited",
-        "SBIN.NSE": "State Bank of India",
-        "TATAMOTORS.NSE": "Tata Motors",
-        "TATASTEEL.NSE": "Tata Steel",
-        "KOTAKBANK.NSE": "Kotak Mahindra Bank",
-        "BHARTIARTL.NSE": "Bharti Airtel",
-        "HINDUNILVR.NSE": "Hindustan Unilever"
-    }
+    "US Markets": [
+        "AAPL", "GOOGL", "MSFT", "BLK", "GS", "STT", "TSLA", "AMZN", "NVDA", "META", "NFLX",
+        "JPM", "V"
+    ],
+    "Indian Markets": [
+        "RELIANCE.NSE", "TCS.NSE", "PARAS.NSE", "INFY.NSE", "HDFCBANK.NSE", "WIPRO.NSE",
+        "ITC.NSE", "SBIN.NSE", "TATAMOTORS.NSE", "TATASTEEL.NSE", "KOTAKBANK.NSE",
+        "BHARTIARTL.NSE", "HINDUNILVR.NSE"
+    ]
 }
\ No newline at end of file
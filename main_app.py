@@ -123,7 +123,8 @@ if __name__ == "__main__":
 import streamlit as st
 import pandas as pd
 import numpy as np
-from modules import data_fetcher, processing, model, charting, ui
+from modules import data_fetcher, processing, model, charting, ui, scheduler, backtest
+import config
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -138,6 +139,10 @@ st.set_page_config(
 def main():
     # --- Apply custom CSS from file ---
     ui.apply_css_from_file("style.css")
+
+    # --- Keep popular tickers warm in the local store ---
+    if config.PREFETCH_ENABLED:
+        scheduler.start_prefetch_scheduler()
     
     # --- Main Header and API Status Check ---
     ui.display_header()
@@ -154,11 +159,12 @@ def main():
                 st.subheader("🔑 Alpha Vantage Status")
                 css_class = "api-working" if api_status['alpha_vantage']['working'] else "api-failed"
                 st.markdown(f'<div class="api-status {css_class}">{api_status["alpha_vantage"]["message"]}</div>', unsafe_allow_html=True)
+            ui.display_http_stats(data_fetcher.get_http_stats())
     
     # --- Sidebar for User Inputs ---
     with st.sidebar:
         ui.display_sidebar_header()
-        data_source_choice, ticker, period, prediction_days, predict_button = ui.get_user_inputs()
+        data_source_choice, ticker, period, timeframe, prediction_days, backtest_folds, backtest_window, predict_button = ui.get_user_inputs()
 
     if predict_button:
         if not ticker:
@@ -176,7 +182,12 @@ def main():
                 used_source = "sample_data"
 
         # Process the data and get info
-        df = processing.process_stock_data(df, ticker, used_source)
+        if processing.TIMEFRAMES[timeframe]:
+            # Coarser bars come from the daily series already loaded: no extra download
+            df = processing.resample_incremental(df, ticker, processing.TIMEFRAMES[timeframe])
+            df = processing.process_stock_data(df, ticker, used_source)
+        else:
+            df = processing.process_stock_data_incremental(df, ticker, used_source)
         stock_info = processing.get_stock_info(ticker)
         currency_symbol = '$' if stock_info.get('currency', 'USD') == 'USD' else '₹'
 
@@ -204,12 +215,24 @@ def main():
 
         with tab2:
             with st.spinner("🧠 Training ML model..."):
-                trained_model, scaler, metrics, feature_importance = model.train_model(df)
+                # Daily models train on features from the whole stored history (see model.training_set)
+                history = data_fetcher.read_store(ticker) if not processing.TIMEFRAMES[timeframe] else None
+                trained_model, scaler, metrics, feature_importance = model.train_model(df, ticker, history=history)
             
             if trained_model:
                 ui.display_prediction_metrics(metrics)
                 next_day_pred = model.predict_next_price(trained_model, scaler, df)
                 ui.display_next_day_prediction(next_day_pred, df, currency_symbol)
+                # The slider is in trading days; coarser timeframes forecast whole bars covering them
+                horizon = processing.bars_for_days(prediction_days, timeframe)
+                bar_name = processing.TIMEFRAME_BARS[timeframe][1]
+                with st.spinner(f"📅 Forecasting {prediction_days} days ahead ({horizon} {bar_name.lower()} bars)..."):
+                    forecaster, forecast_scaler, horizon_rmse = model.train_forecaster(df, horizon, ticker)
+                if forecaster:
+                    forecast = model.forecast_prices(forecaster, forecast_scaler, df, horizon, horizon_rmse)
+                    if forecast is not None:
+                        ui.display_forecast(forecast, df, currency_symbol, bar_name)
+                        charting.display_forecast_chart(df, forecast, ticker, currency_symbol, bar_name=bar_name)
             else:
                 st.error("Failed to train model due to insufficient data or an error.")
 
@@ -221,9 +244,14 @@ def main():
                 ui.display_model_performance(metrics, feature_importance)
             else:
                 st.warning("⚠️ No model performance data available. Training failed.")
+            if backtest_folds:
+                with st.spinner(f"🔁 Running {backtest_folds}-fold walk-forward backtest..."):
+                    folds, summary = backtest.walk_forward(df, backtest_folds, backtest_window)
+                ui.display_backtest(folds, summary)
             
         with tab5:
             ui.display_data_table(df, ticker)
+            ui.display_memory_report(processing.memory_report(df))
             
         ui.display_disclaimer()
     else:
@@ -0,0 +1,104 @@
+import streamlit as st
+import csv
+import re
+import difflib
+from bisect import bisect_left
+import config
+
+# Suffixes other sources use for NSE/BSE listings; the app's own convention is '.NSE'
+INDIAN_SUFFIXES = ('.NSE', '.NS', '.BSE', '.BO')
+# Shape of a US listing (1-5 letters, optional share class): bare symbols like this are fetched
+# as US tickers, so they never alias to an NSE record
+US_SYMBOL = re.compile(r'^[A-Z]{1,5}(-[A-Z])?$')
+
+def normalize_symbol(ticker):
+    """Upper-case a ticker and map Indian exchange suffixes to the app's '.NSE' form."""
+    ticker = ticker.strip().upper()
+    base, dot, suffix = ticker.rpartition('.')
+    if dot and f'.{suffix}' in INDIAN_SUFFIXES:
+        return f'{base}.NSE'
+    return ticker
+
+class TickerCatalog:
+    """
+    Ticker metadata (name, exchange, currency, sector, industry) indexed three ways:
+    a dict for O(1) lookup by symbol (plain NSE symbols like 'RELIANCE' resolve too, unless
+    they could be a US listing, e.g. 'TCS' or 'HAL'),
+    sorted symbol and name-word keys for prefix search by bisection, and fuzzy matching
+    against symbols with the same first letter when a query has few prefix hits.
+    """
+
+    def __init__(self, records):
+        self.records = [dict(record) for record in records]
+        self.by_symbol = {}
+        for i, record in enumerate(self.records):
+            record['symbol'] = normalize_symbol(record['symbol'])
+            self.by_symbol[record['symbol']] = i
+        for i, record in enumerate(self.records):
+            base = record['symbol'].rpartition('.')[0]
+            if record['symbol'].endswith('.NSE') and base not in self.by_symbol and not US_SYMBOL.match(base):
+                self.by_symbol[base] = i
+
+        symbol_keys = sorted((symbol, i) for symbol, i in self.by_symbol.items())
+        self.symbol_keys = [key for key, _ in symbol_keys]
+        self.symbol_ids = [i for _, i in symbol_keys]
+        name_keys = sorted({(word, i) for i, record in enumerate(self.records) for word in record['name'].upper().split()})
+        self.name_keys = [key for key, _ in name_keys]
+        self.name_ids = [i for _, i in name_keys]
+
+    @classmethod
+    def from_csv(cls, path):
+        with open(path, newline='', encoding='utf-8') as f:
+            return cls(csv.DictReader(f))
+
+    def __len__(self):
+        return len(self.records)
+
+    def lookup(self, ticker):
+        """Metadata for a ticker, or None if it is not in the catalog."""
+        i = self.by_symbol.get(normalize_symbol(ticker))
+        return self.records[i] if i is not None else None
+
+    @staticmethod
+    def _prefix_ids(keys, ids, prefix, found, limit):
+        pos = bisect_left(keys, prefix)
+        while pos < len(keys) and len(found) < limit and keys[pos].startswith(prefix):
+            found.setdefault(ids[pos], None)
+            pos += 1
+
+    def search(self, query, limit=10, fuzzy=True):
+        """
+        Records matching a query, best first: exact symbol, symbol prefix, company-name word
+        prefix, then (if still short of `limit`) fuzzy symbol matches for typos.
+        """
+        query = query.strip().upper()
+        if not query:
+            return []
+        found = {}
+        exact = self.by_symbol.get(normalize_symbol(query))
+        if exact is not None:
+            found[exact] = None
+        self._prefix_ids(self.symbol_keys, self.symbol_ids, query, found, limit)
+        self._prefix_ids(self.name_keys, self.name_ids, query.split()[0], found, limit)
+        if fuzzy and len(found) < limit:
+            # Typos are rarely in the first letter: comparing only that bisected slice keeps this fast
+            lo = bisect_left(self.symbol_keys, query[0])
+            hi = bisect_left(self.symbol_keys, chr(ord(query[0]) + 1))
+            for symbol in difflib.get_close_matches(query, self.symbol_keys[lo:hi], n=limit - len(found), cutoff=0.75):
+                found.setdefault(self.by_symbol[symbol], None)
+        return [self.records[i] for i in list(found)[:limit]]
+
+@st.cache_resource
+def get_catalog():
+    """The ticker catalog from config.TICKER_CATALOG_PATH, loaded once per server process."""
+    try:
+        return TickerCatalog.from_csv(config.TICKER_CATALOG_PATH)
+    except Exception as e:
+        print(f"Error loading ticker catalog {config.TICKER_CATALOG_PATH}: {e}")
+        return TickerCatalog([])
+
+def lookup(ticker):
+    return get_catalog().lookup(ticker)
+
+def search(query, limit=10):
+    return get_catalog().search(query, limit)
@@ -2,10 +2,14 @@ import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
+from modules import processing
+
+CHART_INDICATORS = ['MA_20', 'MA_50', 'RSI', 'BB_Upper', 'BB_Lower', 'VWAP', 'MACD', 'MACD_Signal', 'MACD_Hist', 'ATR', 'OBV']
 
 def display_charts(df, ticker, currency_symbol):
     """Display various stock charts using Plotly"""
     st.markdown("### 📈 Stock Price Charts")
+    df = processing.with_indicators(df, CHART_INDICATORS)
     
     # Price chart with moving averages
     fig = go.Figure()
@@ -14,6 +18,11 @@ def display_charts(df, ticker, currency_symbol):
         fig.add_trace(go.Scatter(x=df['Date'], y=df['MA_20'], mode='lines', name='20-Day MA', line=dict(color='#ff7f0e', width=2, dash='dash')))
     if 'MA_50' in df.columns and not df['MA_50'].isna().all():
         fig.add_trace(go.Scatter(x=df['Date'], y=df['MA_50'], mode='lines', name='50-Day MA', line=dict(color='#2ca02c', width=2, dash='dot')))
+    if 'BB_Upper' in df.columns and not df['BB_Upper'].isna().all():
+        fig.add_trace(go.Scatter(x=df['Date'], y=df['BB_Upper'], mode='lines', name='Bollinger Upper', line=dict(color='#7f7f7f', width=1)))
+        fig.add_trace(go.Scatter(x=df['Date'], y=df['BB_Lower'], mode='lines', name='Bollinger Lower', line=dict(color='#7f7f7f', width=1), fill='tonexty', fillcolor='rgba(127, 127, 127, 0.1)'))
+    if 'VWAP' in df.columns and not df['VWAP'].isna().all():
+        fig.add_trace(go.Scatter(x=df['Date'], y=df['VWAP'], mode='lines', name='20-Day VWAP', line=dict(color='#9467bd', width=2, dash='dashdot')))
     
     fig.update_layout(
         title=f"{ticker} Stock Price with Moving Averages",
@@ -38,3 +47,45 @@ def display_charts(df, ticker, currency_symbol):
         fig_rsi.add_hline(y=30, line_dash="dash", line_color="#2ca02c", annotation_text="Oversold (30)")
         fig_rsi.update_layout(title=f"{ticker} RSI (Relative Strength Index)", xaxis_title="Date", yaxis_title="RSI", yaxis=dict(range=[0, 100]), template='plotly_white')
         st.plotly_chart(fig_rsi, use_container_width=True)
+    
+    # MACD chart
+    if 'MACD' in df.columns and not df['MACD'].isna().all():
+        fig_macd = go.Figure()
+        fig_macd.add_trace(go.Bar(x=df['Date'], y=df['MACD_Hist'], name='Histogram', marker_color=['#2ca02c' if v >= 0 else '#d62728' for v in df['MACD_Hist'].fillna(0)]))
+        fig_macd.add_trace(go.Scatter(x=df['Date'], y=df['MACD'], mode='lines', name='MACD (12, 26)', line=dict(color='#1f77b4', width=2)))
+        fig_macd.add_trace(go.Scatter(x=df['Date'], y=df['MACD_Signal'], mode='lines', name='Signal (9)', line=dict(color='#ff7f0e', width=2)))
+        fig_macd.update_layout(title=f"{ticker} MACD", xaxis_title="Date", yaxis_title="MACD", hovermode='x unified', template='plotly_white')
+        st.plotly_chart(fig_macd, use_container_width=True)
+    
+    # ATR and OBV charts
+    col1, col2 = st.columns(2)
+    if 'ATR' in df.columns and not df['ATR'].isna().all():
+        fig_atr = go.Figure()
+        fig_atr.add_trace(go.Scatter(x=df['Date'], y=df['ATR'], mode='lines', name='ATR (14)', line=dict(color='#8c564b', width=2)))
+        fig_atr.update_layout(title=f"{ticker} Average True Range", xaxis_title="Date", yaxis_title=f"ATR ({currency_symbol})", template='plotly_white')
+        col1.plotly_chart(fig_atr, use_container_width=True)
+    if 'OBV' in df.columns and not df['OBV'].isna().all():
+        fig_obv = go.Figure()
+        fig_obv.add_trace(go.Scatter(x=df['Date'], y=df['OBV'], mode='lines', name='OBV', line=dict(color='#17becf', width=2)))
+        fig_obv.update_layout(title=f"{ticker} On-Balance Volume", xaxis_title="Date", yaxis_title="OBV", template='plotly_white')
+        col2.plotly_chart(fig_obv, use_container_width=True)
+
+def display_forecast_chart(df, forecast, ticker, currency_symbol, history=90, bar_name="Day"):
+    """Recent closes followed by the forecast path and its one-RMSE band."""
+    recent = df.tail(history)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=recent['Date'], y=recent['Close'], mode='lines', name='Close Price', line=dict(color='#1f77b4', width=3)))
+    if 'Upper' in forecast.columns:
+        fig.add_trace(go.Scatter(x=forecast['Date'], y=forecast['Upper'], mode='lines', name='Upper (±1 RMSE)', line=dict(color='#7f7f7f', width=1)))
+        fig.add_trace(go.Scatter(x=forecast['Date'], y=forecast['Lower'], mode='lines', name='Lower (±1 RMSE)', line=dict(color='#7f7f7f', width=1), fill='tonexty', fillcolor='rgba(255, 127, 14, 0.15)'))
+    path_x = pd.concat([recent['Date'].tail(1), pd.Series(forecast['Date'])], ignore_index=True)
+    path_y = pd.concat([recent['Close'].tail(1).astype('float64'), forecast['Predicted_Close']], ignore_index=True)
+    fig.add_trace(go.Scatter(x=path_x, y=path_y, mode='lines+markers', name='Forecast', line=dict(color='#ff7f0e', width=2, dash='dash')))
+    fig.update_layout(
+        title=f"{ticker} {len(forecast)}-{bar_name} Price Forecast",
+        xaxis_title="Date",
+        yaxis_title=f"Price ({currency_symbol})",
+        hovermode='x unified',
+        template='plotly_white'
+    )
+    st.plotly_chart(fig, use_container_width=True)
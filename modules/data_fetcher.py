@@ -303,8 +303,20 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import requests
+import asyncio
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import os
+import json
+import threading
 import time
+import zlib
+from collections import OrderedDict
+from itertools import chain
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 import warnings
 warnings.filterwarnings('ignore')
 try:
@@ -312,12 +324,31 @@ try:
     YFINANCE_AVAILABLE = True
 except ImportError:
     YFINANCE_AVAILABLE = False
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 import config
+from modules.processing import freeze_frame
+from modules import quality
 
 ALPHA_VANTAGE_API_KEY = st.secrets.get("ALPHA_VANTAGE_API_KEY")
 
 AV_BASE_URL = 'https://www.alphavantage.co/query'
+# Bars returned by outputsize=compact
+AV_COMPACT_BARS = 100
+
+OHLCV_COLUMNS = ["Date", "Open", "High", "Low", "Close", "Volume"]
+
+_STORE_LOCK = threading.Lock()
 
 def map_ticker_for_source(ticker: str, source: str) -> str:
     """
@@ -337,9 +368,325 @@ def map_ticker_for_source(ticker: str, source: str) -> str:
     return ticker
 
 def get_period_days(period):
-    return {'1mo':30,'3mo':90,'6mo':180,'1y':365,'2y':730,'5y':1825}.get(period,365)
+    return {'1mo':30,'3mo':90,'6mo':180,'1y':365,'2y':730,'5y':1825,'10y':3650}.get(period,365)
 
-@st.cache_data(ttl=config.CACHE_TTL)
+def _normalize_ohlcv(df):
+    """Return df in the canonical Date/Open/High/Low/Close/Volume shape, sorted by date."""
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+    df = df[OHLCV_COLUMNS].copy()
+    df.columns.name = None
+    df['Date'] = pd.to_datetime(df['Date'])
+    if df['Date'].dt.tz is not None:
+        df['Date'] = df['Date'].dt.tz_localize(None)
+    return df.sort_values('Date').reset_index(drop=True)
+
+def _ingest(df, ticker, source):
+    """
+    Normalize, validate and repair (quality.validate_ohlcv) and freeze a downloaded frame, once
+    per download: the result is what gets cached and stored, with the report in attrs['quality'].
+    Alpha Vantage daily bars are not split-adjusted, so split-like jumps are back-adjusted there.
+    """
+    df, report = quality.validate_ohlcv(_normalize_ohlcv(df), market_for_ticker(ticker), adjust_splits=(source == 'alpha_vantage'))
+    df.attrs = {'source': source, 'quality': report}
+    return freeze_frame(df)
+
+def _store_path(ticker):
+    return os.path.join(config.DATA_STORE_DIR, f"{ticker.upper()}.parquet")
+
+# Read-only stored frames already decoded in this process: {path: (mtime_ns, size, df)}
+_STORE_FRAMES = {}
+
+def _remember_store_frame(path, df):
+    stat = os.stat(path)
+    df = freeze_frame(df)
+    _STORE_FRAMES[path] = (stat.st_mtime_ns, stat.st_size, df)
+    return df
+
+def read_store(ticker):
+    """
+    Read the locally stored OHLCV history for a ticker, or None if nothing is stored.
+    The frame is read-only and shared until the file changes, so repeat reads cost a stat().
+    """
+    if not PYARROW_AVAILABLE:
+        return None
+    path = _store_path(ticker)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    cached = _STORE_FRAMES.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    try:
+        table = pq.read_table(path)
+        metadata = table.schema.metadata or {}
+        df = table.to_pandas()
+        df.attrs = {
+            'source': metadata.get(b'source', b'local_store').decode(),
+            'covered_from': pd.Timestamp(metadata[b'covered_from'].decode()) if b'covered_from' in metadata else df['Date'].iloc[0],
+            'quality': json.loads(metadata[b'quality']) if b'quality' in metadata else None,
+        }
+        return _remember_store_frame(path, df)
+    except Exception as e:
+        print(f"Error reading local store for {ticker}: {e}")
+        return None
+
+def write_store(ticker, df, source, covered_from, replace=False):
+    """
+    Merge df into the ticker's stored history (or, with replace, overwrite it) and write it
+    back atomically. covered_from is the earliest date the stored history is known to be
+    complete from. Bars of a session that has not closed yet are still changing, so they are
+    never persisted.
+    """
+    if not PYARROW_AVAILABLE or df is None or df.empty:
+        return None
+    with _STORE_LOCK:
+        try:
+            new_df = _normalize_ohlcv(df)
+            session_end = pd.Timestamp(last_session_close(market_for_ticker(ticker)).date()) + pd.Timedelta(days=1)
+            new_df = new_df[new_df['Date'] < session_end]
+            stored = None if replace else read_store(ticker)
+            if new_df.empty:
+                return stored
+            if stored is not None:
+                covered_from = min(pd.Timestamp(covered_from), stored.attrs['covered_from'])
+                new_df = pd.concat([stored[OHLCV_COLUMNS], new_df], ignore_index=True)
+                new_df = new_df.drop_duplicates('Date', keep='last').sort_values('Date').reset_index(drop=True)
+            table = pa.Table.from_pandas(new_df, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata[b'source'] = source.encode()
+            metadata[b'covered_from'] = pd.Timestamp(covered_from).isoformat().encode()
+            # Report of the latest ingested download, so store hits can show it without re-checking
+            report = df.attrs.get('quality') or (stored.attrs.get('quality') if stored is not None else None)
+            if report is not None:
+                metadata[b'quality'] = json.dumps(report).encode()
+            table = table.replace_schema_metadata(metadata)
+            os.makedirs(config.DATA_STORE_DIR, exist_ok=True)
+            path = _store_path(ticker)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, path)
+            new_df.attrs = {'source': source, 'covered_from': pd.Timestamp(covered_from), 'quality': report}
+            return _remember_store_frame(path, new_df)
+        except Exception as e:
+            print(f"Error writing local store for {ticker}: {e}")
+            return None
+
+# Relative close difference on the overlapping bar above which the stored history is re-based
+SEAM_TOLERANCE = 1e-4
+
+def _seam_factors(stored, new_bars):
+    """
+    (price_factor, volume_factor) that put the stored history on the basis of new_bars.
+    Adjusted sources rescale every earlier price after a split or dividend, so the appended
+    bars are compared with the stored ones on the first bar they share: that bar is final
+    (unlike the last stored bar, which may predate a vendor correction), and a mismatch means
+    the whole stored series needs the same factor. Volume is rescaled only when the shared bar's
+    volume moved by the inverse factor too (a split, not a dividend re-adjustment).
+    """
+    shared = new_bars[new_bars['Date'].isin(stored['Date'])]
+    if shared.empty:
+        # No shared bar to compare: a split-like jump across the seam is only applied when the
+        # open gap and volume confirm it; otherwise it is a real move and prices stay as they are
+        tail = stored[OHLCV_COLUMNS].tail(quality.SPLIT_VOLUME_BARS)
+        seam = pd.concat([tail, new_bars[OHLCV_COLUMNS].head(quality.SPLIT_VOLUME_BARS)], ignore_index=True)
+        factors = np.ones(len(seam))
+        factors[len(tail)] = quality.split_factors(seam['Close'].to_numpy(dtype=np.float64)[len(tail) - 1:len(tail) + 1])[1]
+        open_, close, volume = (seam[column].to_numpy(dtype=np.float64) for column in ("Open", "Close", "Volume"))
+        if factors[len(tail)] == 1.0 or not quality.confirmed_splits(open_, close, volume, factors)[len(tail)]:
+            return 1.0, 1.0
+        return float(factors[len(tail)]), 1.0 / float(factors[len(tail)])
+    first = shared.iloc[0]
+    position = stored['Date'].searchsorted(first['Date'])
+    old_close = float(stored['Close'].iloc[position])
+    ratio = float(first['Close']) / old_close if old_close else 1.0
+    if abs(ratio - 1) <= SEAM_TOLERANCE:
+        return 1.0, 1.0
+    old_volume = float(stored['Volume'].iloc[position])
+    volume_ratio = float(first['Volume']) / old_volume if old_volume else 1.0
+    split_like = quality.split_factors(np.array([1.0, ratio]))[1] != 1.0
+    split = split_like and abs(volume_ratio * ratio - 1) < quality.SPLIT_TOLERANCE
+    return ratio, (1.0 / ratio if split else 1.0)
+
+def _append_to_store(ticker, stored, new_bars, source):
+    """
+    Append bars fetched from the stored history's second-to-last date on. Overlapping bars are
+    replaced by the new values; if the seam shows the source re-adjusted its history, the
+    stored bars are rescaled and the whole series is rewritten. Returns (frame, price_factor).
+    """
+    price_factor, volume_factor = _seam_factors(stored, new_bars)
+    if price_factor == 1.0:
+        return write_store(ticker, new_bars, source, stored.attrs['covered_from']), 1.0
+    history = stored[stored['Date'] < new_bars['Date'].iloc[0]][OHLCV_COLUMNS]
+    history = history.assign(
+        **{column: history[column] * price_factor for column in ("Open", "High", "Low", "Close")},
+        Volume=history['Volume'] * volume_factor,
+    )
+    merged = pd.concat([history, _normalize_ohlcv(new_bars)], ignore_index=True)
+    merged.attrs = dict(new_bars.attrs)
+    if merged.attrs.get('quality'):
+        merged.attrs['quality'] = dict(merged.attrs['quality'], seam_factor=price_factor)
+    return write_store(ticker, merged, source, stored.attrs['covered_from'], replace=True), price_factor
+
+def _covered_from(df, period_start):
+    """Trust a download to cover the requested period unless its first bar starts well after it."""
+    first_date = pd.Timestamp(df['Date'].min())
+    return period_start if first_date <= period_start + timedelta(days=7) else first_date
+
+def _store_is_stale(last_date, market="US"):
+    """A stored series is stale once the bar of the market's last completed session is missing."""
+    return pd.Timestamp(last_date).date() < last_session_close(market).date()
+
+_HTTP_SESSION = None
+_HTTP_LOCK = threading.Lock()
+_HTTP_REQUESTS = {}
+
+def get_http_session():
+    """
+    Process-wide requests.Session with keep-alive connection pooling, gzip, and bounded
+    retries with exponential backoff on 429/5xx. Created lazily on first use.
+    """
+    global _HTTP_SESSION
+    with _HTTP_LOCK:
+        if _HTTP_SESSION is None:
+            retry = Retry(
+                total=config.HTTP_MAX_RETRIES,
+                backoff_factor=config.HTTP_BACKOFF_FACTOR,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(['GET']),
+                respect_retry_after_header=True
+            )
+            adapter = HTTPAdapter(pool_maxsize=config.HTTP_POOL_MAXSIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({'Accept-Encoding': 'gzip, deflate', 'Connection': 'keep-alive'})
+            _HTTP_SESSION = session
+        return _HTTP_SESSION
+
+def http_get(source, url, params=None, timeout=None):
+    """GET through the shared session using the per-source timeout from config.HTTP_TIMEOUTS."""
+    if timeout is None:
+        timeout = config.HTTP_TIMEOUTS.get(source, (5, 30))
+    response = get_http_session().get(url, params=params, timeout=timeout)
+    with _HTTP_LOCK:
+        _HTTP_REQUESTS[source] = _HTTP_REQUESTS.get(source, 0) + 1
+    return response
+
+def get_http_stats():
+    """
+    Connection-reuse stats for the shared session: requests per source, and per host the
+    number of requests served vs. TCP/TLS connections opened.
+    """
+    with _HTTP_LOCK:
+        stats = {'requests_by_source': dict(_HTTP_REQUESTS), 'hosts': {}}
+        session = _HTTP_SESSION
+    if session is None:
+        return stats
+    for prefix in ('https://', 'http://'):
+        pools = session.get_adapter(prefix).poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats['hosts'][pool.host] = {
+                'requests': pool.num_requests,
+                'connections_opened': pool.num_connections,
+                'connections_reused': max(pool.num_requests - pool.num_connections, 0),
+            }
+    return stats
+
+class _TokenBucket:
+    """Thread-safe token bucket; callers only sleep when no token is left."""
+
+    def __init__(self, rate_per_second, capacity):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _reserve(self, max_wait):
+        """Reserve one token; returns how long to wait for it, or None if that would exceed max_wait."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait_time = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if max_wait is not None and wait_time > max_wait:
+                return None
+            # Reserve the token now so concurrent callers queue up behind us
+            self.tokens -= 1
+            return wait_time
+
+    def acquire(self, max_wait=None):
+        """Take one token, sleeping until it is available. Returns False if that would exceed max_wait."""
+        wait_time = self._reserve(max_wait)
+        if wait_time is None:
+            return False
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return True
+
+    async def acquire_async(self, max_wait=None):
+        """Same as acquire, but yields to the event loop while waiting."""
+        wait_time = self._reserve(max_wait)
+        if wait_time is None:
+            return False
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+        return True
+
+_AV_BUCKET = _TokenBucket(config.AV_REQUESTS_PER_MINUTE / 60.0, config.AV_BURST)
+_AV_INFLIGHT = {}
+_AV_INFLIGHT_LOCK = threading.Lock()
+
+def _single_flight(key, func):
+    """Run func once per key at a time; concurrent callers with the same key share its result."""
+    with _AV_INFLIGHT_LOCK:
+        call = _AV_INFLIGHT.get(key)
+        leader = call is None
+        if leader:
+            call = {'event': threading.Event(), 'result': None, 'error': None}
+            _AV_INFLIGHT[key] = call
+    if not leader:
+        call['event'].wait()
+    else:
+        try:
+            call['result'] = func()
+        except Exception as e:
+            call['error'] = e
+        finally:
+            with _AV_INFLIGHT_LOCK:
+                del _AV_INFLIGHT[key]
+            call['event'].set()
+    if call['error'] is not None:
+        raise call['error']
+    return call['result']
+
+def _av_query(symbol, function='TIME_SERIES_DAILY', outputsize='full', timeout=None):
+    """
+    Rate-limited, coalesced Alpha Vantage request. Returns the decoded JSON payload,
+    or None if the rate limiter cannot grant a slot within config.AV_MAX_WAIT.
+    """
+    def request():
+        if not _AV_BUCKET.acquire(max_wait=config.AV_MAX_WAIT):
+            return None
+        params = {
+            'function': function,
+            'symbol': symbol,
+            'apikey': ALPHA_VANTAGE_API_KEY,
+            'outputsize': outputsize,
+            'datatype': 'json'
+        }
+        response = http_get('alpha_vantage', AV_BASE_URL, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+    return _single_flight((symbol, function, outputsize), request)
+
+@st.cache_resource(ttl=config.CACHE_TTL)
 def fetch_stock_data_yfinance(ticker, period="1y"):
     try:
         ticker_mapped = map_ticker_for_source(ticker, "yfinance")
@@ -349,7 +696,8 @@ def fetch_stock_data_yfinance(ticker, period="1y"):
             interval="1d",
             auto_adjust=True,
             threads=False,
-            progress=False
+            progress=False,
+            timeout=config.HTTP_TIMEOUTS["yfinance"]
         )
         if df.empty:
             end = datetime.now()
@@ -361,7 +709,8 @@ def fetch_stock_data_yfinance(ticker, period="1y"):
                 interval="1d",
                 auto_adjust=True,
                 threads=False,
-                progress=False
+                progress=False,
+                timeout=config.HTTP_TIMEOUTS["yfinance"]
             )
         if df.empty:
             return None
@@ -369,116 +718,601 @@ def fetch_stock_data_yfinance(ticker, period="1y"):
         if "Close" not in df.columns and "Adj Close" in df.columns:
             df["Close"] = df["Adj Close"]
         df['Date'] = pd.to_datetime(df['Date'])
-        df.attrs = {'source': 'yfinance'}
-        return df[["Date", "Open", "High", "Low", "Close", "Volume"]]
+        return _ingest(df, ticker, 'yfinance')
     except Exception:
         return None
 
-@st.cache_data(ttl=config.CACHE_TTL)
+@st.cache_resource(ttl=config.CACHE_TTL)
 def fetch_stock_data_unified(ticker, period="1y"):
     try:
         if not ALPHA_VANTAGE_API_KEY:
             return None
         mapped_ticker = map_ticker_for_source(ticker, "alpha_vantage")
-        time.sleep(1)
-        params = {
-            'function': 'TIME_SERIES_DAILY',
-            'symbol': mapped_ticker,
-            'apikey': ALPHA_VANTAGE_API_KEY,
-            'outputsize': 'full',
-            'datatype': 'json'
-        }
-        response = requests.get(AV_BASE_URL, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        if 'Error Message' in data or 'Time Series (Daily)' not in data:
-            return None
-        df = pd.DataFrame.from_dict(data['Time Series (Daily)'], orient='index')
-        df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-        df = df.astype(float)
-        df.index = pd.to_datetime(df.index)
-        df = df.sort_index().reset_index().rename(columns={'index': 'Date'})
         days = get_period_days(period)
         start_date = datetime.now() - timedelta(days=days)
-        df = df[df['Date'] >= start_date]
-        df['Date'] = pd.to_datetime(df['Date'])
-        df.attrs = {'source': 'alpha_vantage'}
-        return df
+        columns = _get_av_daily_series(mapped_ticker, len(pd.bdate_range(start_date, datetime.now())))
+        if columns is None:
+            return None
+        return _ingest(_av_frame(columns, start_date), ticker, 'alpha_vantage')
     except Exception:
         return None
 
-def create_sample_data(ticker, period):
-    # Your existing create_sample_data function
-    days = get_period_days(period)
-    base_prices = {
-        'AAPL': 180,'GOOGL': 140,'MSFT': 330,'BLK': 700,'GS': 340,'STT': 70,'TSLA': 250,'AMZN': 140,
-        'NVDA': 450,'META': 300,'NFLX': 400,'JPM': 150,'V': 230,'RELIANCE': 2500,'TCS': 3500,
-        'PARAS': 700,'INFY': 1500,'HDFCBANK': 1600,'WIPRO': 400,'ITC': 450,'SBIN': 600,
-        'TATAMOTORS': 650,'TATASTEEL': 120,'KOTAKBANK': 1900,'BHARTIARTL': 850,'HINDUNILVR': 2500
+def market_for_ticker(ticker):
+    """Market key in config.MARKET_SESSIONS that a ticker trades on."""
+    return "NSE" if ticker.upper().endswith(('.NSE', '.NS', '.BSE')) else "US"
+
+# (market, year) pairs whose holiday coverage has been checked, so the warning prints once
+_HOLIDAY_YEARS_CHECKED = set()
+
+def is_trading_day(market, day):
+    """Weekday that is not one of the market's config.MARKET_HOLIDAYS."""
+    holidays = config.MARKET_HOLIDAYS.get(market, ())
+    if (market, day.year) not in _HOLIDAY_YEARS_CHECKED:
+        _HOLIDAY_YEARS_CHECKED.add((market, day.year))
+        if not any(holiday.startswith(f"{day.year}-") for holiday in holidays):
+            print(f"Warning: config.MARKET_HOLIDAYS['{market}'] has no dates for {day.year}; its holidays will be treated as trading days")
+    return day.weekday() < 5 and day.strftime('%Y-%m-%d') not in holidays
+
+def _session_time(market, day, which):
+    session = config.MARKET_SESSIONS[market]
+    hour, minute = session[which]
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=ZoneInfo(session["tz"]))
+
+def last_session_close(market, now=None):
+    """Close of the most recent completed trading session at or before `now`, tz-aware in the market's zone."""
+    now = now or datetime.now(ZoneInfo("UTC"))
+    day = now.astimezone(ZoneInfo(config.MARKET_SESSIONS[market]["tz"])).date()
+    while not (is_trading_day(market, day) and _session_time(market, day, "close") <= now):
+        day -= timedelta(days=1)
+    return _session_time(market, day, "close")
+
+def next_session_close(market, now=None):
+    """Close of the next trading session that ends after `now`."""
+    day = last_session_close(market, now).date() + timedelta(days=1)
+    while not is_trading_day(market, day):
+        day += timedelta(days=1)
+    return _session_time(market, day, "close")
+
+def market_is_open(market, now=None):
+    """True between the open and close of a trading day, i.e. while the day's bar is still forming."""
+    now = now or datetime.now(ZoneInfo("UTC"))
+    day = now.astimezone(ZoneInfo(config.MARKET_SESSIONS[market]["tz"])).date()
+    return is_trading_day(market, day) and _session_time(market, day, "open") <= now < _session_time(market, day, "close")
+
+def session_key(ticker, now=None):
+    """Date of the ticker's last completed trading session: no new daily bar can exist until it changes."""
+    return last_session_close(market_for_ticker(ticker), now).date()
+
+def get_universe_tickers():
+    """All tickers in config.RELIABLE_TICKERS, across markets."""
+    return [ticker for stocks in config.RELIABLE_TICKERS.values() for ticker in stocks]
+
+def _split_batch_download(raw, mapped_to_ticker):
+    """Split a grouped yf.download frame into per-ticker OHLCV frames."""
+    frames = {}
+    if raw is None or raw.empty:
+        return frames
+    for mapped, ticker in mapped_to_ticker.items():
+        try:
+            if isinstance(raw.columns, pd.MultiIndex):
+                if mapped not in raw.columns.get_level_values(0):
+                    continue
+                sub = raw[mapped]
+            elif len(mapped_to_ticker) == 1:
+                sub = raw
+            else:
+                continue
+            sub = sub.dropna(how='all')
+            if sub.empty:
+                continue
+            sub = sub.reset_index()
+            sub = sub.rename(columns={sub.columns[0]: 'Date'})
+            if "Close" not in sub.columns and "Adj Close" in sub.columns:
+                sub["Close"] = sub["Adj Close"]
+            df = _normalize_ohlcv(sub)
+            df.attrs = {'source': 'yfinance'}
+            frames[ticker] = df
+        except Exception as e:
+            print(f"Error splitting batch data for {ticker}: {e}")
+    return frames
+
+@st.cache_resource(ttl=config.CACHE_TTL)
+def fetch_stock_data_batch(tickers, period="1y", batch_size=config.BATCH_DOWNLOAD_SIZE, start=None):
+    """
+    Fetch many tickers with grouped yfinance downloads, batch_size symbols per request.
+    Returns {ticker: df} in the same Date/Open/High/Low/Close/Volume shape as
+    fetch_stock_data_yfinance; tickers with no data are left out.
+    If start ('YYYY-MM-DD') is given, bars from that date on are fetched instead of `period`.
+    """
+    if not YFINANCE_AVAILABLE:
+        return {}
+    tickers = list(dict.fromkeys(tickers))
+    frames = {}
+    for i in range(0, len(tickers), batch_size):
+        batch = tickers[i:i + batch_size]
+        mapped_to_ticker = {map_ticker_for_source(t, "yfinance"): t for t in batch}
+        try:
+            raw = yf.download(
+                list(mapped_to_ticker),
+                **({'start': start} if start else {'period': period}),
+                interval="1d",
+                auto_adjust=True,
+                group_by="ticker",
+                threads=True,
+                progress=False,
+                timeout=config.HTTP_TIMEOUTS["yfinance"]
+            )
+        except Exception as e:
+            print(f"Error fetching batch {batch}: {e}")
+            continue
+        frames.update(_split_batch_download(raw, mapped_to_ticker))
+    return {ticker: _ingest(df, ticker, 'yfinance') for ticker, df in frames.items()}
+
+def warm_store(tickers=None, period="1y"):
+    """
+    Refresh the local store for a watchlist (default: the whole RELIABLE_TICKERS universe)
+    with grouped downloads. Tickers whose stored history already covers the period only
+    fetch bars from their last stored date on. Returns the list of tickers that were refreshed.
+    """
+    tickers = tickers or get_universe_tickers()
+    period_start = pd.Timestamp(datetime.now() - timedelta(days=get_period_days(period))).normalize()
+    full, since_dates = [], {}
+    for ticker in dict.fromkeys(tickers):
+        stored = read_store(ticker)
+        if stored is not None and not stored.empty and stored.attrs['covered_from'] <= period_start:
+            since_dates[ticker] = stored['Date'].iloc[max(len(stored) - 2, 0)]
+        else:
+            full.append(ticker)
+
+    refreshed = []
+    for ticker, df in (fetch_stock_data_batch(full, period) if full else {}).items():
+        write_store(ticker, df, 'yfinance', _covered_from(df, period_start))
+        refreshed.append(ticker)
+    if since_dates:
+        # Re-fetch the last two stored bars too: corrects the last one and checks the seam
+        since = min(since_dates.values()).strftime('%Y-%m-%d')
+        for ticker, df in fetch_stock_data_batch(list(since_dates), period, start=since).items():
+            df = df[df['Date'] >= since_dates[ticker]].reset_index(drop=True)
+            stored = read_store(ticker)
+            if not df.empty and stored is not None:
+                _append_to_store(ticker, stored, df, 'yfinance')
+                refreshed.append(ticker)
+    return refreshed
+
+_AV_PRICE_FIELDS = itemgetter('1. open', '2. high', '3. low', '4. close')
+_AV_VOLUME_FIELD = itemgetter('5. volume')
+
+def decode_av_daily(data, start_date=None):
+    """
+    Decode a TIME_SERIES_DAILY payload straight into typed NumPy columns, oldest bar first:
+    {'Date': datetime64[ns], 'Open'/'High'/'Low'/'Close': float64, 'Volume': int64}.
+    Bars before start_date are dropped before any number is parsed.
+    """
+    series = data['Time Series (Daily)']
+    dates = np.array(list(series.keys()))
+    bars = list(series.values())
+    # ISO 'YYYY-MM-DD' keys sort chronologically as plain strings
+    order = np.argsort(dates, kind='stable')
+    if start_date is not None:
+        order = order[dates[order] >= pd.Timestamp(start_date).strftime('%Y-%m-%d')]
+    bars = [bars[i] for i in order]
+    n = len(bars)
+    prices = np.fromiter(
+        map(float, chain.from_iterable(map(_AV_PRICE_FIELDS, bars))), dtype=np.float64, count=4 * n
+    ).reshape(n, 4)
+    volume = np.fromiter(map(float, map(_AV_VOLUME_FIELD, bars)), dtype=np.float64, count=n).astype(np.int64)
+    return {
+        'Date': dates[order].astype('datetime64[D]').astype('datetime64[ns]'),
+        'Open': prices[:, 0],
+        'High': prices[:, 1],
+        'Low': prices[:, 2],
+        'Close': prices[:, 3],
+        'Volume': volume,
     }
-    base_name = ticker.split('.')[0].upper()
-    base_price = base_prices.get(base_name, 1000)
-    np.random.seed(hash(ticker) % 2**32)
-    dates = pd.date_range(end=datetime.now(), periods=days, freq='B')
+
+def _av_frame(columns, start_date):
+    """Slice decoded columns to the bars on/after start_date, then build the DataFrame."""
+    start = np.searchsorted(columns['Date'], np.datetime64(pd.Timestamp(start_date), 'ns'))
+    df = pd.DataFrame({name: values[start:] for name, values in columns.items()})
+    df.attrs = {'source': 'alpha_vantage'}
+    return df
+
+# Decoded Alpha Vantage columns per symbol: {symbol: (fetched_at, outputsize, columns)}
+_AV_SERIES_CACHE = {}
+_AV_SERIES_LOCK = threading.Lock()
+
+def _get_av_daily_series(mapped_ticker, bars_needed):
+    """
+    Return the decoded daily columns for a symbol, downloading as little as possible.
+    'compact' (latest 100 bars) is used when bars_needed fits in it; a 'full' series,
+    once downloaded, serves every period for that symbol until config.CACHE_TTL expires.
+    """
+    outputsize = _av_outputsize(bars_needed)
+    columns = _lookup_av_series(mapped_ticker, outputsize)
+    if columns is not None:
+        return columns
+    data = _av_query(mapped_ticker, outputsize=outputsize)
+    return _remember_av_series(mapped_ticker, outputsize, data)
+
+def _av_outputsize(bars_needed):
+    return 'compact' if bars_needed <= AV_COMPACT_BARS else 'full'
+
+def _lookup_av_series(mapped_ticker, outputsize):
+    with _AV_SERIES_LOCK:
+        cached = _AV_SERIES_CACHE.get(mapped_ticker)
+    if cached is not None:
+        fetched_at, cached_size, columns = cached
+        if time.monotonic() - fetched_at < config.CACHE_TTL and (cached_size == 'full' or outputsize == 'compact'):
+            return columns
+    return None
+
+def _remember_av_series(mapped_ticker, outputsize, data):
+    """Decode a TIME_SERIES_DAILY payload and cache the columns; returns None for error payloads."""
+    if not data or 'Error Message' in data or 'Time Series (Daily)' not in data:
+        return None
+    columns = decode_av_daily(data)
+    with _AV_SERIES_LOCK:
+        _AV_SERIES_CACHE[mapped_ticker] = (time.monotonic(), outputsize, columns)
+    return columns
+
+@st.cache_resource(ttl=config.CACHE_TTL)
+def fetch_stock_data_since(ticker, since, source):
+    """
+    Fetch only the daily bars from `since` ('YYYY-MM-DD') on, inclusive, from a single source.
+    Callers pass a stored date so the overlap corrects bars stored before they were final.
+    """
+    try:
+        start = pd.Timestamp(since)
+        if source == "yfinance":
+            if not YFINANCE_AVAILABLE:
+                return None
+            df = yf.download(
+                map_ticker_for_source(ticker, "yfinance"),
+                start=start.strftime("%Y-%m-%d"),
+                interval="1d",
+                auto_adjust=True,
+                threads=False,
+                progress=False,
+                timeout=config.HTTP_TIMEOUTS["yfinance"]
+            )
+            if df.empty:
+                return None
+            df = _normalize_ohlcv(df.reset_index())
+        elif source == "alpha_vantage":
+            if not ALPHA_VANTAGE_API_KEY:
+                return None
+            columns = _get_av_daily_series(
+                map_ticker_for_source(ticker, "alpha_vantage"),
+                len(pd.bdate_range(start, datetime.now()))
+            )
+            if columns is None:
+                return None
+            df = _av_frame(columns, start)
+        else:
+            return None
+        df = df[df['Date'] >= start].reset_index(drop=True)
+        return _ingest(df, ticker, source)
+    except Exception:
+        return None
+
+SAMPLE_BASE_PRICES = {
+    'AAPL': 180,'GOOGL': 140,'MSFT': 330,'BLK': 700,'GS': 340,'STT': 70,'TSLA': 250,'AMZN': 140,
+    'NVDA': 450,'META': 300,'NFLX': 400,'JPM': 150,'V': 230,'RELIANCE': 2500,'TCS': 3500,
+    'PARAS': 700,'INFY': 1500,'HDFCBANK': 1600,'WIPRO': 400,'ITC': 450,'SBIN': 600,
+    'TATAMOTORS': 650,'TATASTEEL': 120,'KOTAKBANK': 1900,'BHARTIARTL': 850,'HINDUNILVR': 2500
+}
+
+def _reflected_walk(start, steps, lo, hi, block=8192):
+    """
+    Vectorized x[i] = clip(x[i-1] + steps[i], lo, hi) with x[0] = start.
+    Between touches of opposite bounds the walk is a one-sided reflection, which has a
+    closed form (cumsum plus running max of the overshoot). Blocks of `block` rows are
+    solved at once; the loop runs once per block or lo<->hi crossing, not once per row.
+    """
+    n = len(steps)
+    x = np.empty(n)
+    x[0] = start
+    i, bound = 0, None
+    while i < n - 1:
+        stop = min(n, i + 1 + block)
+        path = x[i] + np.cumsum(steps[i + 1:stop])
+        if bound == 'hi':
+            path = path - np.maximum.accumulate(np.maximum(path - hi, 0.0))
+            escaped = np.flatnonzero(path < lo)
+        else:
+            path = path + np.maximum.accumulate(np.maximum(lo - path, 0.0))
+            escaped = np.flatnonzero(path > hi)
+        if escaped.size == 0:
+            x[i + 1:stop] = path
+            i = stop - 1
+            continue
+        k = escaped[0]
+        x[i + 1:i + 1 + k] = path[:k]
+        i += k + 1
+        bound = 'lo' if bound == 'hi' else 'hi'
+        x[i] = lo if bound == 'lo' else hi
+    return x
+
+def generate_ohlcv(n_rows, base_price=1000.0, seed=0, end=None, freq='B'):
+    """
+    Generate a synthetic OHLCV frame of n_rows bars ending at `end` (default: now).
+    Fully vectorized; prices stay within [0.5, 3] x base_price. Used for the sample-data
+    fallback and for load-test fixtures (e.g. freq='min' for intraday bars).
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp(end or datetime.now())
+    if freq == 'B':
+        # numpy's business-day arithmetic is much faster than pd.date_range(freq='B')
+        days = np.busday_offset(np.datetime64(end.date(), 'D'), np.arange(1 - n_rows, 1), roll='backward')
+        dates = pd.DatetimeIndex(days) + (end - end.normalize())
+    else:
+        dates = pd.date_range(end=end, periods=n_rows, freq=freq)
     daily_return = 0.08 / 252
     volatility = 0.02
-    returns = np.random.normal(daily_return, volatility, days)
-    prices = [base_price]
-    for i in range(1, days):
-        new_price = prices[-1] * (1 + returns[i])
-        new_price = max(new_price, base_price * 0.5)
-        new_price = min(new_price, base_price * 3.0)
-        prices.append(new_price)
-    data = []
-    for i, close_price in enumerate(prices):
-        daily_vol = abs(np.random.normal(0, 0.015))
-        if i == 0:
-            open_price = close_price
-        else:
-            gap = np.random.normal(0, 0.005)
-            open_price = prices[i-1] * (1 + gap)
-        intraday_range = abs(np.random.normal(0, daily_vol))
-        high = max(open_price, close_price) * (1 + intraday_range)
-        low = min(open_price, close_price) * (1 - intraday_range)
-        high = max(open_price, close_price, high)
-        low = min(open_price, close_price, low)
-        base_volume = 1000000 if base_price < 1000 else 100000
-        volume = int(np.random.lognormal(np.log(base_volume), 0.8))
-        data.append({
-            'Date': dates[i],
-            'Open': round(open_price, 2),
-            'High': round(high, 2),
-            'Low': round(low, 2),
-            'Close': round(close_price, 2),
-            'Volume': volume
-        })
-    df = pd.DataFrame(data)
-    df['Date'] = pd.to_datetime(df['Date'])
+    returns = rng.normal(daily_return, volatility, n_rows)
+    log_steps = np.log1p(np.maximum(returns, -0.999))
+    close = np.exp(_reflected_walk(
+        np.log(base_price), log_steps, np.log(base_price * 0.5), np.log(base_price * 3.0)
+    ))
+    daily_vol = np.abs(rng.normal(0, 0.015, n_rows))
+    gap = rng.normal(0, 0.005, n_rows)
+    open_ = np.empty(n_rows)
+    open_[0] = close[0]
+    open_[1:] = close[:-1] * (1 + gap[1:])
+    intraday_range = np.abs(rng.normal(0, 1, n_rows) * daily_vol)
+    high = np.maximum(open_, close) * (1 + intraday_range)
+    low = np.minimum(open_, close) * (1 - intraday_range)
+    base_volume = 1000000 if base_price < 1000 else 100000
+    volume = rng.lognormal(np.log(base_volume), 0.8, n_rows).astype(np.int64)
+    return pd.DataFrame({
+        'Date': dates,
+        'Open': np.round(open_, 2),
+        'High': np.round(high, 2),
+        'Low': np.round(low, 2),
+        'Close': np.round(close, 2),
+        'Volume': volume
+    })
+
+def create_sample_data(ticker, period):
+    days = get_period_days(period)
+    base_name = ticker.split('.')[0].upper()
+    base_price = SAMPLE_BASE_PRICES.get(base_name, 1000)
+    # crc32 is stable across processes, unlike hash() on str
+    df = generate_ohlcv(days, base_price, seed=zlib.crc32(ticker.encode()))
     df.attrs = {'source': 'sample_data', 'ticker': ticker}
     return df
 
-def load_stock_data_auto(ticker, period="1y"):
+def _load_from_store(ticker, period_start, data_sources, trace):
+    """
+    Serve the period from the local store, appending any bars newer than the last stored date.
+    Returns None when nothing usable is stored, so the caller falls back to a full download.
+    """
+    stored = read_store(ticker)
+    if stored is None or stored.empty:
+        return None
+    if stored.attrs['covered_from'] > period_start:
+        trace.append(("local_store", "❌ Local store does not cover the requested period"))
+        return None
+
+    last_date = stored['Date'].iloc[-1]
+    if _store_is_stale(last_date, market_for_ticker(ticker)):
+        # Overlap two stored bars: the last one gets its final values, the one before checks the seam
+        since = stored['Date'].iloc[max(len(stored) - 2, 0)]
+        for source_key, _, available, _ in data_sources:
+            if not available:
+                continue
+            new_bars = fetch_stock_data_since(ticker, since.strftime('%Y-%m-%d'), source_key)
+            if new_bars is not None and not new_bars.empty:
+                updated, price_factor = _append_to_store(ticker, stored, new_bars, source_key)
+                if updated is not None:
+                    stored = updated
+                if price_factor != 1.0:
+                    trace.append(("local_store", f"🔁 Local store history rescaled ×{price_factor:.4g} to match {source_key}'s latest adjustments"))
+                trace.append(("local_store", f"✅ Local store appended {int((new_bars['Date'] > last_date).sum())} new bars from {source_key}"))
+                break
+        else:
+            trace.append(("local_store", f"⚠️ Local store not refreshed; last stored bar is {last_date:%Y-%m-%d}"))
+
+    # A positional slice of the shared stored frame: no data is copied
+    df = stored.iloc[stored['Date'].searchsorted(period_start):].reset_index(drop=True)
+    if df.empty:
+        return None
+    df.attrs = {'source': 'local_store', 'quality': stored.attrs.get('quality')}
+    trace.append(("local_store", f"✅ Local store loaded {len(df)} bars"))
+    return df
+
+def _is_valid_frame(df):
+    return df is not None and not df.empty
+
+def _race_sources(ticker, period, sources, trace, hedge_delay, deadline):
+    """
+    Start sources[0] now and each following source hedge_delay seconds after the previous one
+    (or as soon as everything in flight has failed). The first valid frame wins; sources still
+    in flight are abandoned. Returns (df, source_key), or (None, None) once the deadline passes.
     """
-    Try yfinance -> Alpha Vantage -> sample, and return (df, used_source, trace_list)
+    executor = ThreadPoolExecutor(max_workers=len(sources))
+    started = {}
+    pending = set()
+    t0 = time.monotonic()
+    next_idx = 0
+    next_launch = t0
+    winner = (None, None)
+    try:
+        while True:
+            if next_idx < len(sources) and (time.monotonic() >= next_launch or not pending):
+                source_key, fetch_func = sources[next_idx]
+                future = executor.submit(fetch_func, ticker, period)
+                started[future] = (source_key, time.monotonic())
+                pending.add(future)
+                next_idx += 1
+                next_launch = time.monotonic() + hedge_delay
+            if not pending:
+                break
+            remaining = deadline - (time.monotonic() - t0)
+            if remaining <= 0:
+                break
+            timeout = remaining
+            if next_idx < len(sources):
+                timeout = min(timeout, max(0.0, next_launch - time.monotonic()))
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                source_key, start = started[future]
+                elapsed = time.monotonic() - start
+                try:
+                    df = future.result()
+                except Exception:
+                    df = None
+                if winner[0] is not None:
+                    continue
+                if _is_valid_frame(df):
+                    trace.append((source_key, f"✅ {source_key.capitalize()} loaded successfully ({elapsed:.2f}s)"))
+                    winner = (df, source_key)
+                else:
+                    trace.append((source_key, f"❌ {source_key.capitalize()} failed (no/invalid data, {elapsed:.2f}s)"))
+            if winner[0] is not None:
+                break
+    finally:
+        reason = "lost the race" if winner[0] is not None else "deadline exceeded"
+        for future in pending:
+            source_key, start = started[future]
+            future.cancel()
+            trace.append((source_key, f"⏹️ {source_key.capitalize()} abandoned after {time.monotonic() - start:.2f}s ({reason})"))
+        executor.shutdown(wait=False, cancel_futures=True)
+    return winner
+
+# Frames loaded during the ticker's current trading session, least recently used first:
+# {ticker: {'session', 'loaded_at', 'store_version', 'covered_from', 'df', 'source'}}
+_SESSION_FRAMES = OrderedDict()
+_SESSION_FRAMES_LOCK = threading.Lock()
+
+def _store_version(ticker):
+    """(mtime_ns, size) of the ticker's store file, or None if it has none."""
+    try:
+        stat = os.stat(_store_path(ticker))
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def _session_cache_get(ticker, period_start):
+    """
+    (df, source) for the period sliced out of the frame loaded for the same trading session,
+    or None. Outside market hours an entry stays valid until the next session closes (so
+    weekend/holiday reloads never hit the network); while the market is open it expires after
+    config.CACHE_TTL seconds, since the day's bar is still changing. Any rewrite of the store
+    file (a prefetch, a repair) drops the entry. A slice carries the quality report of the
+    bars it serves, not of the wider frame.
+    """
+    with _SESSION_FRAMES_LOCK:
+        entry = _SESSION_FRAMES.get(ticker)
+        if entry is not None:
+            _SESSION_FRAMES.move_to_end(ticker)
+    if entry is None or entry['session'] != session_key(ticker) or entry['covered_from'] > period_start:
+        return None
+    if market_is_open(market_for_ticker(ticker)) and time.monotonic() - entry['loaded_at'] > config.CACHE_TTL:
+        return None
+    if entry['store_version'] != _store_version(ticker):
+        with _SESSION_FRAMES_LOCK:
+            if _SESSION_FRAMES.get(ticker) is entry:
+                del _SESSION_FRAMES[ticker]
+        return None
+    stored = entry['df']
+    start = stored['Date'].searchsorted(period_start)
+    df = stored.iloc[start:].reset_index(drop=True)
+    df.attrs = dict(stored.attrs)
+    if start and df.attrs.get('quality'):
+        df.attrs['quality'] = quality.window_report(df.attrs['quality'], df, market_for_ticker(ticker))
+    return df, entry['source']
+
+def _session_cache_put(ticker, df, source, covered_from):
+    """Remember a loaded frame for the session unless a wider, still current one for the same session is already held."""
+    session = session_key(ticker)
+    store_version = _store_version(ticker)
+    frame = freeze_frame(_normalize_ohlcv(df))
+    frame.attrs = dict(df.attrs)
+    with _SESSION_FRAMES_LOCK:
+        entry = _SESSION_FRAMES.get(ticker)
+        if (entry is not None and entry['session'] == session and entry['covered_from'] < covered_from
+                and entry['store_version'] == store_version and not market_is_open(market_for_ticker(ticker))):
+            return
+        _SESSION_FRAMES[ticker] = {
+            'session': session,
+            'loaded_at': time.monotonic(),
+            'store_version': store_version,
+            'covered_from': pd.Timestamp(covered_from),
+            'df': frame,
+            'source': source,
+        }
+        _SESSION_FRAMES.move_to_end(ticker)
+        while len(_SESSION_FRAMES) > config.SESSION_CACHE_SIZE:
+            _SESSION_FRAMES.popitem(last=False)
+
+def _trace_quality(trace, df):
+    """Add the ingestion data-quality summary for df (if it carries one) to the status trace."""
+    report = df.attrs.get('quality')
+    if report:
+        trace.append(("quality", quality.summarize(report)))
+
+def load_stock_data_auto(ticker, period="1y", mode=None):
+    """
+    Try local store -> yfinance -> Alpha Vantage -> sample, and return (df, used_source, trace_list)
     where trace_list is a list of (source_key, human_message).
+    mode overrides config.FETCH_MODE ("sequential", "hedged" or "parallel").
     """
     trace = []
-    
+    mode = mode or config.FETCH_MODE
+
     data_sources = [
         ('yfinance', fetch_stock_data_yfinance, YFINANCE_AVAILABLE, 'yfinance library is not installed'),
         ('alpha_vantage', fetch_stock_data_unified, ALPHA_VANTAGE_API_KEY, 'Alpha Vantage API key not found')
     ]
+    period_start = pd.Timestamp(datetime.now() - timedelta(days=get_period_days(period))).normalize()
+
+    # Same trading session as an earlier load that covered at least this period: slice it
+    cached = _session_cache_get(ticker, period_start)
+    if cached is not None:
+        df, source_key = cached
+        trace.append(("session_cache", f"✅ Served {len(df)} bars from cache for the {session_key(ticker):%Y-%m-%d} session"))
+        _trace_quality(trace, df)
+        return df, source_key, trace
 
-    for source_key, fetch_func, available, unavailable_msg in data_sources:
-        if available:
-            df = fetch_func(ticker, period)
-            if df is not None and not df.empty:
-                trace.append((source_key, f"✅ {source_key.capitalize()} loaded successfully"))
+    # Local store first: only the bars after the last stored date go over the network
+    df_store = _load_from_store(ticker, period_start, data_sources, trace)
+    if df_store is not None:
+        _session_cache_put(ticker, df_store, "local_store", period_start)
+        _trace_quality(trace, df_store)
+        return df_store, "local_store", trace
+
+    if mode in ("hedged", "parallel"):
+        sources = []
+        for source_key, fetch_func, available, unavailable_msg in data_sources:
+            if available:
+                sources.append((source_key, fetch_func))
+            else:
+                trace.append((source_key, f"❌ {unavailable_msg}"))
+        if sources:
+            hedge_delay = config.FETCH_HEDGE_DELAY if mode == "hedged" else 0.0
+            df, source_key = _race_sources(ticker, period, sources, trace, hedge_delay, config.FETCH_DEADLINE)
+            if _is_valid_frame(df):
+                write_store(ticker, df, source_key, _covered_from(df, period_start))
+                _session_cache_put(ticker, df, source_key, _covered_from(df, period_start))
+                _trace_quality(trace, df)
                 return df, source_key, trace
+    else:
+        for source_key, fetch_func, available, unavailable_msg in data_sources:
+            if available:
+                start = time.monotonic()
+                df = fetch_func(ticker, period)
+                elapsed = time.monotonic() - start
+                if _is_valid_frame(df):
+                    trace.append((source_key, f"✅ {source_key.capitalize()} loaded successfully ({elapsed:.2f}s)"))
+                    write_store(ticker, df, source_key, _covered_from(df, period_start))
+                    _session_cache_put(ticker, df, source_key, _covered_from(df, period_start))
+                    _trace_quality(trace, df)
+                    return df, source_key, trace
+                else:
+                    trace.append((source_key, f"❌ {source_key.capitalize()} failed (no/invalid data, {elapsed:.2f}s)"))
             else:
-                trace.append((source_key, f"❌ {source_key.capitalize()} failed (no/invalid data)"))
-        else:
-            trace.append((source_key, f"❌ {unavailable_msg}"))
+                trace.append((source_key, f"❌ {unavailable_msg}"))
 
     # Last resort: Sample data
     df_sample = create_sample_data(ticker, period)
@@ -486,13 +1320,132 @@ def load_stock_data_auto(ticker, period="1y"):
     trace.append(("sample_data", "⚠️ Using sample data (all APIs unavailable)"))
     return df_sample, "sample_data", trace
 
+async def fetch_stock_data_yfinance_async(ticker, period="1y", executor=None):
+    """
+    Async counterpart of fetch_stock_data_yfinance. yfinance is blocking, so it runs in
+    `executor` (default: the event loop's default thread pool).
+    """
+    if not YFINANCE_AVAILABLE:
+        return None
+    return await asyncio.get_running_loop().run_in_executor(executor, fetch_stock_data_yfinance, ticker, period)
+
+async def _av_query_async(session, symbol, outputsize):
+    """aiohttp version of _av_query: shares the process-wide token bucket and retry policy."""
+    if not await _AV_BUCKET.acquire_async(max_wait=config.AV_MAX_WAIT):
+        return None
+    params = {
+        'function': 'TIME_SERIES_DAILY',
+        'symbol': symbol,
+        'apikey': ALPHA_VANTAGE_API_KEY,
+        'outputsize': outputsize,
+        'datatype': 'json'
+    }
+    connect_timeout, read_timeout = config.HTTP_TIMEOUTS['alpha_vantage']
+    timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+    for attempt in range(config.HTTP_MAX_RETRIES + 1):
+        async with session.get(AV_BASE_URL, params=params, timeout=timeout) as response:
+            with _HTTP_LOCK:
+                _HTTP_REQUESTS['alpha_vantage'] = _HTTP_REQUESTS.get('alpha_vantage', 0) + 1
+            if response.status in (429, 500, 502, 503, 504) and attempt < config.HTTP_MAX_RETRIES:
+                await asyncio.sleep(config.HTTP_BACKOFF_FACTOR * 2 ** attempt)
+                continue
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+async def fetch_stock_data_unified_async(ticker, period="1y", session=None):
+    """
+    Async counterpart of fetch_stock_data_unified. Pass an aiohttp.ClientSession to share
+    connections across calls; without aiohttp the blocking fetcher runs in a worker thread.
+    """
+    try:
+        if not ALPHA_VANTAGE_API_KEY:
+            return None
+        if not AIOHTTP_AVAILABLE:
+            return await asyncio.to_thread(fetch_stock_data_unified, ticker, period)
+        mapped_ticker = map_ticker_for_source(ticker, "alpha_vantage")
+        start_date = datetime.now() - timedelta(days=get_period_days(period))
+        outputsize = _av_outputsize(len(pd.bdate_range(start_date, datetime.now())))
+        columns = _lookup_av_series(mapped_ticker, outputsize)
+        if columns is None:
+            if session is None:
+                async with aiohttp.ClientSession() as own_session:
+                    data = await _av_query_async(own_session, mapped_ticker, outputsize)
+            else:
+                data = await _av_query_async(session, mapped_ticker, outputsize)
+            columns = _remember_av_series(mapped_ticker, outputsize, data)
+            if columns is None:
+                return None
+        return _ingest(_av_frame(columns, start_date), ticker, 'alpha_vantage')
+    except Exception:
+        return None
+
+async def load_many(tickers, period="1y", concurrency=None):
+    """
+    Async generator yielding (ticker, df, used_source) for each ticker as soon as it is loaded,
+    at most `concurrency` (default config.ASYNC_MAX_CONCURRENCY) at a time. Sources are tried
+    like load_stock_data_auto (local store -> yfinance -> Alpha Vantage) but there is no sample
+    fallback: a ticker nobody can serve yields (ticker, None, None). Usable outside Streamlit:
+
+        async for ticker, df, source in data_fetcher.load_many(tickers, "1y"):
+            ...
+    """
+    concurrency = concurrency or config.ASYNC_MAX_CONCURRENCY
+    semaphore = asyncio.Semaphore(concurrency)
+    # Blocking work (yfinance, Parquet I/O) gets its own pool so it is not capped by the default one
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    loop = asyncio.get_running_loop()
+    period_start = pd.Timestamp(datetime.now() - timedelta(days=get_period_days(period))).normalize()
+    data_sources = [
+        ('yfinance', fetch_stock_data_yfinance, YFINANCE_AVAILABLE, 'yfinance library is not installed'),
+        ('alpha_vantage', fetch_stock_data_unified, ALPHA_VANTAGE_API_KEY, 'Alpha Vantage API key not found')
+    ]
+    session = aiohttp.ClientSession(headers={'Accept-Encoding': 'gzip, deflate'}) if AIOHTTP_AVAILABLE else None
+    if session is None:
+        print("aiohttp is not installed: Alpha Vantage requests in load_many run one worker thread per call")
+
+    async def load_one(ticker):
+        async with semaphore:
+            try:
+                df = await loop.run_in_executor(executor, _load_from_store, ticker, period_start, data_sources, [])
+                if df is not None:
+                    return ticker, df, "local_store"
+                for source_key, fetch_async in (
+                    ('yfinance', lambda t, p: fetch_stock_data_yfinance_async(t, p, executor)),
+                    ('alpha_vantage', lambda t, p: fetch_stock_data_unified_async(t, p, session)),
+                ):
+                    df = await fetch_async(ticker, period)
+                    if _is_valid_frame(df):
+                        await loop.run_in_executor(executor, write_store, ticker, df, source_key, _covered_from(df, period_start))
+                        return ticker, df, source_key
+            except Exception as e:
+                # One failing ticker must not end the generator and cancel the others
+                print(f"Error loading {ticker}: {e}")
+            return ticker, None, None
+
+    tasks = [asyncio.create_task(load_one(ticker)) for ticker in dict.fromkeys(tickers)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        if session is not None:
+            await session.close()
+        executor.shutdown(wait=False)
+
+def load_many_sync(tickers, period="1y", concurrency=None):
+    """Blocking wrapper around load_many for scripts and batch jobs: returns {ticker: (df, used_source)}."""
+    async def collect():
+        return {ticker: (df, source) async for ticker, df, source in load_many(tickers, period, concurrency)}
+    return asyncio.run(collect())
+
 def test_api_connections():
     status = {}
     
     # Test yfinance
     if YFINANCE_AVAILABLE:
         try:
-            yf.download("AAPL", period="1d", progress=False, threads=False)
+            yf.download("AAPL", period="1d", progress=False, threads=False, timeout=config.HTTP_TIMEOUTS["yfinance"])
             status['yfinance'] = {'working': True, 'message': "✅ yfinance is installed and working."}
         except Exception:
             status['yfinance'] = {'working': False, 'message': "❌ yfinance is installed but failed to fetch data."}
@@ -502,8 +1455,8 @@ def test_api_connections():
     # Test Alpha Vantage
     if ALPHA_VANTAGE_API_KEY:
         try:
-            response = requests.get(f"{AV_BASE_URL}?function=TIME_SERIES_DAILY&symbol=AAPL&apikey={ALPHA_VANTAGE_API_KEY}&outputsize=compact", timeout=5)
-            if response.status_code == 200 and 'Time Series (Daily)' in response.json():
+            data = _av_query("AAPL", outputsize='compact', timeout=5)
+            if data and 'Time Series (Daily)' in data:
                 status['alpha_vantage'] = {'working': True, 'message': "✅ Alpha Vantage API key is valid."}
             else:
                 status['alpha_vantage'] = {'working': False, 'message': f"❌ Alpha Vantage API key is invalid or request failed."}
@@ -4,51 +4,176 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 import numpy as np
+import copy
 import streamlit as st
+import config
+from modules import processing, registry
 import warnings
 warnings.filterwarnings('ignore')
 
+MODEL_INDICATORS = ['MA_20', 'MA_50', 'RSI', 'Price_Change', 'Volume_MA'] + [f'Close_Lag_{i}' for i in [1, 2, 3, 5]]
+if config.MODEL_EXTENDED_FEATURES:
+    MODEL_INDICATORS += processing.EXTENDED_INDICATORS
+# Part of every registry key: changing these trains (and stores) a new model
+MODEL_PARAMS = {'n_estimators': 100, 'max_depth': 10, 'random_state': 42}
+
 def prepare_features(df):
-    feature_columns = ['Open', 'High', 'Low', 'Volume', 'MA_20', 'MA_50', 'RSI','Price_Change', 'Volume_MA']
-    for i in [1, 2, 3, 5]:
-        if f'Close_Lag_{i}' in df.columns:
-            feature_columns.append(f'Close_Lag_{i}')
+    # Indicator columns come from the shared registry, so ones the charts already computed are reused
+    df = processing.with_indicators(df, MODEL_INDICATORS)
+    feature_columns = ['Open', 'High', 'Low', 'Volume'] + MODEL_INDICATORS
     existing_features = [col for col in feature_columns if col in df.columns]
     X = df[existing_features].copy()
     y = df['Close'].copy()
     return X, y, existing_features
 
-def train_model(df):
+def fit_model(X, y, feature_names, params=None, n_jobs=-1):
+    """Fit scaler and forest on a chronological 80/20 split: (model, scaler, metrics, feature_importance)."""
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, shuffle=False
+    )
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+    model = RandomForestRegressor(**(params or MODEL_PARAMS), n_jobs=n_jobs)
+    model.fit(X_train_scaled, y_train)
+    y_train_pred = model.predict(X_train_scaled)
+    y_test_pred = model.predict(X_test_scaled)
+    metrics = {
+        'train_rmse': np.sqrt(mean_squared_error(y_train, y_train_pred)),
+        'test_rmse': np.sqrt(mean_squared_error(y_test, y_test_pred)),
+        'train_mae': mean_absolute_error(y_train, y_train_pred),
+        'test_mae': mean_absolute_error(y_test, y_test_pred),
+        'train_r2': r2_score(y_train, y_train_pred),
+        'test_r2': r2_score(y_test, y_test_pred),
+        'train_size': len(X_train),
+        'test_size': len(X_test)
+    }
+    return model, scaler, metrics, _importance_frame(feature_names, model)
+
+def train_entry(X, y, feature_names, params, n_jobs=-1, span=None):
+    """
+    Full fit of a registry entry: model, scaler, metrics, importances and the data it has seen
+    (row count and, when span is given, the (first_date, last_date) of those rows).
+    """
+    model, scaler, metrics, feature_importance = fit_model(X, y, feature_names, params, n_jobs)
+    first_date, last_date = span or (None, None)
+    return {
+        'model': model, 'scaler': scaler, 'metrics': metrics,
+        'feature_importance': feature_importance, 'feature_names': feature_names, 'params': params,
+        'rows': len(X), 'updates': 0, 'first_date': first_date, 'last_date': last_date,
+    }
+
+def training_set(df, ticker, params, history=None):
+    """
+    The rows the ticker's price model trains on and their registry key:
+    (X, y, feature_names, dates, key). With the ticker's full stored daily history (ending on
+    df's last bar), features are computed over all of it, so they do not depend on where the
+    requested period starts. The rows start at the first date of the ticker's latest entry
+    when that is at most config.MODEL_UPDATE_WINDOW bars before df's first bar (the rolling
+    period window moved on since), otherwise at df's first bar. Successive days then keep
+    the same first date and only gain rows at the end.
+    """
+    source = df
+    if history is not None and len(history) and pd.Timestamp(history['Date'].iloc[-1]) == pd.Timestamp(df['Date'].iloc[-1]):
+        source = history
+    X, y, feature_names = prepare_features(source)
+    dates = pd.DatetimeIndex(pd.to_datetime(source['Date']))
+    start = int(dates.searchsorted(pd.Timestamp(df['Date'].iloc[0])))
+    previous = registry.latest(ticker, params)
+    first_date = previous.get('first_date') if previous is not None else None
+    if first_date is not None:
+        anchor = int(dates.searchsorted(first_date))
+        if anchor < len(dates) and dates[anchor] == first_date and 0 <= start - anchor <= config.MODEL_UPDATE_WINDOW:
+            start = anchor
+    X, y, dates = X.iloc[start:], y.iloc[start:], dates[start:]
+    return X, y, feature_names, dates, registry.model_key(X, y, params)
+
+def _importance_frame(feature_names, model):
+    return pd.DataFrame({
+        'feature': feature_names,
+        'importance': model.feature_importances_
+    }).sort_values('importance', ascending=False)
+
+def update_model(entry, X, y, params, dates):
+    """
+    Warm-start update of a registry entry whose training rows are the rows of (X, y) up to its
+    last date (dates are the rows' bar dates; see training_set): fit config.MODEL_UPDATE_TREES
+    new trees on the most recent rows, then retire as many old ones by
+    config.MODEL_RETIRE_POLICY, so the forest size and the per-update cost stay bounded.
+    The entry's scaler is kept. Returns the updated entry, or None when a full retrain is due:
+    the rows up to its last date differ from the ones it was trained on, there are too many
+    new rows or updates, or the model's error on the new bars has drifted past
+    config.MODEL_DRIFT_TOLERANCE x its test RMSE.
+    """
+    first_date, last_date = entry.get('first_date'), entry.get('last_date')
+    if first_date is None or len(dates) == 0 or dates[0] != first_date:
+        return None
+    seen = int(dates.searchsorted(last_date, side='right'))
+    n_new = len(X) - seen
+    window = config.MODEL_UPDATE_WINDOW
+    if seen != entry.get('rows', 0) or not 0 < n_new <= window or entry.get('updates', 0) >= config.MODEL_MAX_UPDATES:
+        return None
+    if registry.model_key(X.iloc[:seen], y.iloc[:seen], params) != entry.get('key'):
+        return None
+
+    scaler = entry['scaler']
+    X_new = scaler.transform(X.iloc[seen:].to_numpy(dtype=np.float64))
+    y_new = y.iloc[seen:].to_numpy(dtype=np.float64)
+    recent_rmse = float(np.sqrt(np.mean((entry['model'].predict(X_new) - y_new) ** 2)))
+    if recent_rmse > config.MODEL_DRIFT_TOLERANCE * entry['metrics']['test_rmse']:
+        return None
+
+    # Shallow copy with its own estimator list: the stored entry's trees are shared, not copied
+    model = copy.copy(entry['model'])
+    model.estimators_ = list(entry['model'].estimators_)
+    n_old = len(model.estimators_)
+    n_trees = config.MODEL_UPDATE_TREES
+    X_recent = scaler.transform(X.iloc[-window:].to_numpy(dtype=np.float64))
+    y_recent = y.iloc[-window:].to_numpy(dtype=np.float64)
+    if config.MODEL_RETIRE_POLICY == "worst":
+        errors = [np.mean((tree.predict(X_recent) - y_recent) ** 2) for tree in model.estimators_]
+        keep = np.sort(np.argsort(errors)[:n_old - n_trees])
+    else:
+        keep = np.arange(n_trees, n_old)
+    updates = entry.get('updates', 0) + 1
+    model.set_params(warm_start=True, n_estimators=n_old + n_trees, random_state=params['random_state'] + updates)
+    model.fit(X_recent, y_recent)
+    model.estimators_ = [model.estimators_[i] for i in keep] + model.estimators_[n_old:]
+    model.set_params(warm_start=False, n_estimators=len(model.estimators_), random_state=params['random_state'])
+
+    metrics = dict(entry['metrics'], recent_rmse=recent_rmse, updates=updates)
+    return dict(entry, model=model, metrics=metrics, feature_importance=_importance_frame(entry['feature_names'], model),
+                rows=len(X), updates=updates, last_date=dates[-1])
+
+def train_model(df, ticker=None, params=None, incremental=None, history=None):
+    """
+    Train (or, with a ticker, fetch from the model registry) the price model for df.
+    Registry entries are keyed by the feature matrix and hyperparameters, so a repeat
+    prediction on unchanged data loads the stored model instead of training. With a ticker
+    the rows come from training_set (pass the ticker's stored daily history as `history`),
+    and when they only gained new bars since the ticker's last model, that model is
+    warm-started (update_model) unless incremental (default config.MODEL_INCREMENTAL) is False.
+    """
     try:
-        X, y, feature_names = prepare_features(df)
+        params = dict(MODEL_PARAMS, **(params or {}))
+        if ticker:
+            X, y, feature_names, dates, key = training_set(df, ticker, params, history)
+        else:
+            X, y, feature_names = prepare_features(df)
         if X.empty or y.empty:
             st.error("Insufficient data for training")
             return None, None, None, None
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42, shuffle=False
-        )
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_test_scaled = scaler.transform(X_test)
-        model = RandomForestRegressor(n_estimators=100, max_depth=10, random_state=42, n_jobs=-1)
-        model.fit(X_train_scaled, y_train)
-        y_train_pred = model.predict(X_train_scaled)
-        y_test_pred = model.predict(X_test_scaled)
-        metrics = {
-            'train_rmse': np.sqrt(mean_squared_error(y_train, y_train_pred)),
-            'test_rmse': np.sqrt(mean_squared_error(y_test, y_test_pred)),
-            'train_mae': mean_absolute_error(y_train, y_train_pred),
-            'test_mae': mean_absolute_error(y_test, y_test_pred),
-            'train_r2': r2_score(y_train, y_train_pred),
-            'test_r2': r2_score(y_test, y_test_pred),
-            'train_size': len(X_train),
-            'test_size': len(X_test)
-        }
-        feature_importance = pd.DataFrame({
-            'feature': feature_names,
-            'importance': model.feature_importances_
-        }).sort_values('importance', ascending=False)
-        return model, scaler, metrics, feature_importance
+        if ticker:
+            entry = registry.load(ticker, key)
+            if entry is None and (config.MODEL_INCREMENTAL if incremental is None else incremental):
+                previous = registry.latest(ticker, params)
+                entry = update_model(previous, X, y, params, dates) if previous is not None else None
+                if entry is not None:
+                    entry = registry.save(ticker, key, entry)
+            if entry is None:
+                entry = registry.save(ticker, key, train_entry(X, y, feature_names, params, span=(dates[0], dates[-1])))
+            return entry['model'], entry['scaler'], entry['metrics'], entry['feature_importance']
+        return fit_model(X, y, feature_names, params)
     except Exception as e:
         st.error(f"Error training model: {str(e)}")
         return None, None, None, None
@@ -64,4 +189,77 @@ def predict_next_price(model, scaler, df):
         return prediction
     except Exception as e:
         st.error(f"Error making prediction: {str(e)}")
-        return None
\ No newline at end of file
+        return None
+
+def forecast_targets(y, horizon):
+    """Close 1..horizon bars ahead of each row: an (n, horizon) array, NaN past the end."""
+    close = np.asarray(y, dtype=np.float64)
+    Y = np.full((len(close), horizon), np.nan)
+    for h in range(1, horizon + 1):
+        Y[:-h, h - 1] = close[h:]
+    return Y
+
+def fit_forecaster(X, Y, params=None):
+    """
+    Direct multi-horizon model: one multi-output forest maps today's features to the next
+    horizon closes, so a 30-day path costs one fit and one predict rather than 30 recursive
+    steps. Returns (model, scaler, test_rmse per horizon) from a chronological 80/20 split.
+    """
+    X, Y = np.asarray(X, dtype=np.float64), np.asarray(Y, dtype=np.float64)
+    split = int(len(X) * 0.8)
+    scaler = StandardScaler()
+    X_train = scaler.fit_transform(X[:split])
+    model = RandomForestRegressor(**(params or MODEL_PARAMS), n_jobs=-1)
+    model.fit(X_train, Y[:split])
+    test_pred = model.predict(scaler.transform(X[split:])).reshape(len(X) - split, -1)
+    test_rmse = np.sqrt(np.mean((test_pred - Y[split:]) ** 2, axis=0))
+    return model, scaler, test_rmse
+
+def train_forecaster(df, horizon, ticker=None, params=None):
+    """Train (or, with a ticker, fetch from the model registry) the direct forecaster for `horizon` bars."""
+    try:
+        X, y, feature_names = prepare_features(df)
+        Y = forecast_targets(y, horizon)[:-horizon]
+        X = X.iloc[:-horizon]
+        if len(X) < 10:
+            st.error("Insufficient data for a multi-day forecast")
+            return None, None, None
+        params = dict(MODEL_PARAMS, **(params or {}))
+        key = registry.model_key(X, y, dict(params, horizon=horizon)) if ticker else None
+        entry = registry.load(ticker, key) if ticker else None
+        if entry is None:
+            model, scaler, test_rmse = fit_forecaster(X, Y, params)
+            entry = {'model': model, 'scaler': scaler, 'test_rmse': test_rmse, 'feature_names': feature_names, 'params': params, 'horizon': horizon}
+            if ticker:
+                entry = registry.save(ticker, key, entry)
+        return entry['model'], entry['scaler'], entry['test_rmse']
+    except Exception as e:
+        st.error(f"Error training forecaster: {str(e)}")
+        return None, None, None
+
+def _future_dates(dates, horizon):
+    """The next `horizon` bar dates: business days for daily bars, else the frame's typical bar spacing."""
+    dates = pd.to_datetime(pd.Series(dates))
+    step = dates.diff().median() if len(dates) > 1 else pd.Timedelta(days=1)
+    if step <= pd.Timedelta(days=4):
+        return pd.bdate_range(dates.iloc[-1] + pd.Timedelta(days=1), periods=horizon)
+    return pd.DatetimeIndex([dates.iloc[-1] + step * h for h in range(1, horizon + 1)])
+
+def forecast_prices(model, scaler, df, horizon, test_rmse=None):
+    """
+    Forecast path from the last bar: a DataFrame of Date, Predicted_Close and, when the
+    per-horizon test RMSE is given, Lower/Upper bands of one RMSE.
+    """
+    try:
+        X, _, _ = prepare_features(df)
+        if X.empty:
+            return None
+        path = np.asarray(model.predict(scaler.transform(X.iloc[-1:].to_numpy(dtype=np.float64)))).reshape(-1)[:horizon]
+        forecast = pd.DataFrame({'Date': _future_dates(df['Date'], horizon), 'Predicted_Close': path})
+        if test_rmse is not None:
+            forecast['Lower'] = path - np.asarray(test_rmse)[:horizon]
+            forecast['Upper'] = path + np.asarray(test_rmse)[:horizon]
+        return forecast
+    except Exception as e:
+        st.error(f"Error making forecast: {str(e)}")
+        return None
@@ -86,8 +86,11 @@ def safe_stat(df, col, func, label, fmt="{:.2f}", currency_symbol=""):
 import pandas as pd
 import numpy as np
 import streamlit as st
+import threading
+from collections import deque, OrderedDict
 from datetime import datetime, timedelta
 import config
+from modules import catalog
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -100,8 +103,14 @@ def calculate_rsi(prices, window=14):
     rsi = 100 - (100 / (1 + rs))
     return rsi
 
-def process_stock_data(df, ticker, source):
-    """Process and enhance stock data with technical indicators"""
+def process_stock_data(df, ticker, source, indicators=None):
+    """
+    Process and enhance stock data with technical indicators. `indicators` is a list of
+    registered indicator names (default INDICATOR_COLUMNS); dependencies are resolved and
+    memoized through the indicator registry.
+    df is never modified (it may be a shared cache entry): the result is a new read-only frame
+    whose base columns share memory with df and whose indicators are the memoized arrays.
+    """
     if df is None or df.empty:
         return None
     
@@ -109,17 +118,13 @@ def process_stock_data(df, ticker, source):
     if 'Date' not in df.columns and df.index.name == 'Date':
         df = df.reset_index()
     
-    df['Date'] = pd.to_datetime(df['Date']) # Added this line
-    
-    # Calculate all the technical indicators
-    df['MA_20'] = df['Close'].rolling(window=20).mean()
-    df['MA_50'] = df['Close'].rolling(window=50).mean()
-    df['RSI'] = calculate_rsi(df['Close'])
-    df['Price_Change'] = df['Close'].pct_change()
-    df['Volume_MA'] = df['Volume'].rolling(window=10).mean()
+    if not pd.api.types.is_datetime64_any_dtype(df['Date']):
+        df = df.assign(Date=pd.to_datetime(df['Date']))
     
-    for i in [1, 2, 3, 5]:
-        df[f'Close_Lag_{i}'] = df['Close'].shift(i)
+    # Calculate the requested technical indicators
+    names = INDICATOR_COLUMNS if indicators is None else indicators
+    derived = pd.DataFrame(get_indicators(df, names, ticker), index=df.index, copy=False)
+    df = pd.concat([df.drop(columns=derived.columns.intersection(df.columns)), derived], axis=1)
     
     # NOTE: The df.dropna() line below was causing charts to not display
     # certain lines (like MA and RSI) due to removing the initial rows
@@ -128,41 +133,661 @@ def process_stock_data(df, ticker, source):
     # For now, let's comment it out to ensure the charts render correctly.
     # df = df.dropna()
     
+    if config.COMPACT_FRAMES:
+        df = compact_frame(df)
     df.attrs = {'source': source,'ticker': ticker,'last_updated': datetime.now()}
-    return df
+    return freeze_frame(df)
 
-def get_stock_info(ticker):
-    stock_info = {
-    'AAPL': {'name': 'Apple Inc.', 'sector': 'Technology', 'industry': 'Consumer Electronics', 'currency': 'USD'},
-    'MSFT': {'name': 'Microsoft Corporation', 'sector': 'Technology', 'industry': 'Software', 'currency': 'USD'},
-    'BLK': {'name': 'BlackRock, Inc.', 'sector': 'Financial Services', 'industry': 'Asset Management', 'currency': 'USD'},
-    'GS': {'name': 'Goldman Sachs Group, Inc.', 'sector': 'Financial Services', 'industry': 'Capital Markets', 'currency': 'USD'},
-    'STT': {'name': 'State Street Corporation', 'sector': 'Financial Services', 'industry': 'Asset Management', 'currency': 'USD'},
-    'GOOGL': {'name': 'Alphabet Inc.', 'sector': 'Technology', 'industry': 'Internet Services', 'currency': 'USD'},
-    'AMZN': {'name': 'Amazon.com, Inc.', 'sector': 'Consumer Cyclical', 'industry': 'Internet Retail', 'currency': 'USD'},
-    'META': {'name': 'Meta Platforms, Inc.', 'sector': 'Communication Services', 'industry': 'Social Media', 'currency': 'USD'},
-    'TSLA': {'name': 'Tesla, Inc.', 'sector': 'Consumer Cyclical', 'industry': 'Auto Manufacturers', 'currency': 'USD'},
-    'NVDA': {'name': 'NVIDIA Corporation', 'sector': 'Technology', 'industry': 'Semiconductors', 'currency': 'USD'},
-    'JPM': {'name': 'JPMorgan Chase & Co.', 'sector': 'Financial Services', 'industry': 'Banks—Diversified', 'currency': 'USD'},
-    'V': {'name': 'Visa Inc.', 'sector': 'Financial Services', 'industry': 'Credit Services', 'currency': 'USD'},
-    'WMT': {'name': 'Walmart Inc.', 'sector': 'Consumer Defensive', 'industry': 'Discount Stores', 'currency': 'USD'},
-    'RELIANCE': {'name': 'Reliance Industries Limited', 'sector': 'Energy', 'industry': 'Oil & Gas', 'currency': 'INR'},
-    'TCS': {'name': 'Tata Consultancy Services', 'sector': 'Technology', 'industry': 'IT Services', 'currency': 'INR'},
-    'PARAS': {'name': 'Paras Defence and Space Technologies Ltd.', 'sector': 'Industrials', 'industry': 'Defense & Aerospace', 'currency': 'INR'},
-    'INFY': {'name': 'Infosys Limited', 'sector': 'Technology', 'industry': 'IT Services', 'currency': 'INR'},
-    'HDFCBANK': {'name': 'HDFC Bank Limited', 'sector': 'Financial Services', 'industry': 'Banking', 'currency': 'INR'},
-    'ICICIBANK': {'name': 'ICICI Bank Limited', 'sector': 'Financial Services', 'industry': 'Banking', 'currency': 'INR'},
-    'HINDUNILVR': {'name': 'Hindustan Unilever Limited', 'sector': 'Consumer Defensive', 'industry': 'Household & Personal Products', 'currency': 'INR'},
-    'BHARTIARTL': {'name': 'Bharti Airtel Limited', 'sector': 'Communication Services', 'industry': 'Telecom Services', 'currency': 'INR'},
-    'SBIN': {'name': 'State Bank of India', 'sector': 'Financial Services', 'industry': 'Banking', 'currency': 'INR'},
-    'ITC': {'name': 'ITC Limited', 'sector': 'Consumer Defensive', 'industry': 'Tobacco & FMCG', 'currency': 'INR'},
-    'KOTAKBANK': {'name': 'Kotak Mahindra Bank Limited', 'sector': 'Financial Services', 'industry': 'Banking', 'currency': 'INR'},
+BASE_COLUMNS = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+LAG_PERIODS = [1, 2, 3, 5]
+INDICATOR_COLUMNS = ['MA_20', 'MA_50', 'RSI', 'Price_Change', 'Volume_MA'] + [f'Close_Lag_{i}' for i in LAG_PERIODS]
+
+# Indicator registry: {name: {'inputs': (...), 'window': bars of history needed, 'func': f(*inputs), 'raw': bool}}.
+# Inputs are OHLCV columns or other registered indicators; func gets them as Series, or as
+# NumPy arrays when registered with raw=True.
+_INDICATORS = {}
+
+def register_indicator(name, inputs, window=1, raw=False):
+    """Decorator adding func(*inputs) -> values to the registry under `name`."""
+    def decorator(func):
+        _INDICATORS[name] = {'inputs': tuple(inputs), 'window': window, 'func': func, 'raw': raw}
+        return func
+    return decorator
+
+def list_indicators():
+    """Registered indicator names with their declared inputs and window."""
+    return {name: {'inputs': spec['inputs'], 'window': spec['window']} for name, spec in _INDICATORS.items()}
+
+register_indicator('MA_20', ['Close'], 20)(lambda close: close.rolling(window=20).mean())
+register_indicator('MA_50', ['Close'], 50)(lambda close: close.rolling(window=50).mean())
+register_indicator('RSI', ['Close'], 15)(calculate_rsi)
+register_indicator('Price_Change', ['Close'], 2)(lambda close: close.pct_change())
+register_indicator('Volume_MA', ['Volume'], 10)(lambda volume: volume.rolling(window=10).mean())
+for _lag in LAG_PERIODS:
+    register_indicator(f'Close_Lag_{_lag}', ['Close'], _lag + 1)(lambda close, lag=_lag: close.shift(lag))
+
+# Extended indicators. Each is a NumPy kernel over float64 arrays (registered with raw=True),
+# so a column costs a few array passes and no intermediate pandas objects.
+
+def _as_float(values):
+    return np.asarray(values, dtype=np.float64)
+
+def _rolling_sum(values, window):
+    """Trailing `window`-bar sum with NaN for the first window-1 bars (cumsum differences)."""
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        cs = np.cumsum(values)
+        out[window - 1] = cs[window - 1]
+        out[window:] = cs[window:] - cs[:-window]
+    return out
+
+def _ema_scan(x, out, start, stop, prev, alpha, block):
+    """Blocked EMA recursion over the gap-free x[start:stop], continuing from prev."""
+    d = 1.0 - alpha
+    # d**-block must stay far from overflow: cap the block so it is at most ~1e100
+    block = max(1, min(block, int(230.0 / -np.log(d))))
+    powers = d ** np.arange(block + 1)
+    inverse = 1.0 / powers[:-1]
+    for s in range(start, stop, block):
+        chunk = x[s:min(s + block, stop)]
+        m = len(chunk)
+        acc = np.cumsum(chunk * inverse[:m]) * powers[:m] * alpha
+        out[s:s + m] = acc + powers[1:m + 1] * prev
+        prev = out[s + m - 1]
+    return prev
+
+def ema_kernel(values, alpha, seed=None, block=4096):
+    """
+    Exponential moving average y[t] = (1 - alpha) * y[t-1] + alpha * x[t], the same recursion
+    as pandas ewm(alpha=alpha, adjust=False). Leading NaNs stay NaN; the recursion starts at the
+    first finite value, or from `seed` (the value before values[0]) when given. Interior NaNs
+    are handled like pandas (ignore_na=False): the last value is carried through the gap, and
+    the first value after a gap of k bars is (d**(k+1) * y + alpha * x) / (d**(k+1) + alpha).
+
+    The recursion is unrolled in blocks: within a block y[s+j] = d**(j+1) * y[s-1] +
+    alpha * d**j * cumsum(x * d**-k), with d = 1 - alpha. Blocks stay short enough for d**-k
+    to remain well inside float64 range, so the scan is a handful of vector ops per block.
+    """
+    x = _as_float(values)
+    out = np.full(len(x), np.nan)
+    finite = np.flatnonzero(~np.isnan(x))
+    if len(finite) == 0:
+        return out
+    if seed is None:
+        prev, last = x[finite[0]], finite[0]
+        out[last] = prev
+        finite = finite[1:]
+    else:
+        prev, last = float(seed), -1
+    d = 1.0 - alpha
+    # Runs of consecutive finite values: each is one blocked scan, gaps are bridged between runs
+    for run in np.split(finite, np.flatnonzero(np.diff(finite) > 1) + 1):
+        if len(run) == 0:
+            continue
+        first, stop = run[0], run[-1] + 1
+        gap = first - last - 1
+        if gap > 0:
+            out[last + 1:first] = prev if last >= 0 else np.nan
+            old_weight = d ** (gap + 1)
+            prev = (old_weight * prev + alpha * x[first]) / (old_weight + alpha) if old_weight + alpha > 0 else x[first]
+            out[first] = prev
+            first += 1
+        if d <= 0.0:
+            out[first:stop] = x[first:stop]
+            prev = out[stop - 1]
+        elif first < stop:
+            prev = _ema_scan(x, out, first, stop, prev, alpha, block)
+        last = stop - 1
+    out[last + 1:] = prev
+    return out
+
+def macd_kernel(close, fast=12, slow=26):
+    """MACD line: EMA(fast) - EMA(slow) of close."""
+    close = _as_float(close)
+    return ema_kernel(close, 2.0 / (fast + 1)) - ema_kernel(close, 2.0 / (slow + 1))
+
+def bollinger_std_kernel(close, window=20):
+    """
+    Population standard deviation over the trailing window (Bollinger's definition).
+    Sums run on values centred on their mean so the cumsum differences keep their precision.
+    """
+    close = _as_float(close)
+    centred = close - np.nanmean(close) if len(close) else close
+    mean = _rolling_sum(centred, window) / window
+    var = _rolling_sum(centred * centred, window) / window - mean * mean
+    return np.sqrt(np.maximum(var, 0.0))
+
+def true_range_kernel(high, low, close):
+    """max(High - Low, |High - previous Close|, |Low - previous Close|); the first bar is High - Low."""
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    tr = high - low
+    if len(tr) > 1:
+        prev_close = close[:-1]
+        tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)))
+    return tr
+
+def atr_kernel(high, low, close, window=14):
+    """Wilder's Average True Range: seeded with the mean of the first `window` true ranges, then alpha = 1/window."""
+    tr = true_range_kernel(high, low, close)
+    out = np.full(len(tr), np.nan)
+    if len(tr) >= window:
+        out[window - 1] = tr[:window].mean()
+        out[window:] = ema_kernel(tr[window:], 1.0 / window, seed=out[window - 1])
+    return out
+
+def obv_kernel(close, volume):
+    """On-Balance Volume: running sum of volume signed by the close-to-close direction, starting at 0."""
+    close, volume = _as_float(close), _as_float(volume)
+    signed = np.zeros(len(close))
+    signed[1:] = np.sign(np.diff(close)) * volume[1:]
+    return np.cumsum(signed)
+
+def vwap_kernel(high, low, close, volume, window=20):
+    """
+    Volume-weighted average of the typical price (High + Low + Close) / 3 over a trailing window.
+    The classic session-anchored VWAP needs intraday bars; on daily bars it is a rolling window.
+    """
+    high, low, close, volume = _as_float(high), _as_float(low), _as_float(close), _as_float(volume)
+    typical = (high + low + close) / 3.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _rolling_sum(typical * volume, window) / _rolling_sum(volume, window)
+
+EXTENDED_INDICATORS = ['EMA_12', 'EMA_26', 'MACD', 'MACD_Signal', 'MACD_Hist', 'BB_Upper', 'BB_Lower', 'ATR', 'OBV', 'VWAP']
+
+register_indicator('EMA_12', ['Close'], 12, raw=True)(lambda close: ema_kernel(close, 2.0 / 13))
+register_indicator('EMA_26', ['Close'], 26, raw=True)(lambda close: ema_kernel(close, 2.0 / 27))
+register_indicator('MACD', ['EMA_12', 'EMA_26'], 26, raw=True)(lambda fast, slow: fast - slow)
+register_indicator('MACD_Signal', ['MACD'], 34, raw=True)(lambda macd: ema_kernel(macd, 2.0 / 10))
+register_indicator('MACD_Hist', ['MACD', 'MACD_Signal'], 34, raw=True)(lambda macd, signal: macd - signal)
+register_indicator('BB_Std', ['Close'], 20, raw=True)(bollinger_std_kernel)
+register_indicator('BB_Upper', ['MA_20', 'BB_Std'], 20, raw=True)(lambda ma, std: ma + 2 * std)
+register_indicator('BB_Lower', ['MA_20', 'BB_Std'], 20, raw=True)(lambda ma, std: ma - 2 * std)
+register_indicator('ATR', ['High', 'Low', 'Close'], 15, raw=True)(atr_kernel)
+register_indicator('OBV', ['Close', 'Volume'], 2, raw=True)(obv_kernel)
+register_indicator('VWAP', ['High', 'Low', 'Close', 'Volume'], 20, raw=True)(vwap_kernel)
+
+# Memoized indicator values per (ticker, data version), least recently used first
+_INDICATOR_MEMO = OrderedDict()
+_INDICATOR_MEMO_LOCK = threading.Lock()
+
+def data_version(df):
+    """Content hash of a frame's Date/OHLCV columns: equal frames share memoized indicators."""
+    base = [col for col in BASE_COLUMNS if col in df.columns]
+    return len(df), int(pd.util.hash_pandas_object(df[base], index=False).sum())
+
+def get_indicators(df, names, ticker=None):
+    """
+    Compute the named indicators (and whatever they depend on) for df, reusing values already
+    memoized for the same ticker and data version. Returns {name: numpy array aligned with df}.
+    """
+    ticker = ticker if ticker is not None else df.attrs.get('ticker')
+    key = (ticker, data_version(df))
+    with _INDICATOR_MEMO_LOCK:
+        memo = _INDICATOR_MEMO.get(key)
+        if memo is None:
+            memo = _INDICATOR_MEMO[key] = {}
+            while len(_INDICATOR_MEMO) > config.INDICATOR_MEMO_SIZE:
+                _INDICATOR_MEMO.popitem(last=False)
+        _INDICATOR_MEMO.move_to_end(key)
+
+    def resolve(name, pending=()):
+        if name in memo:
+            return memo[name]
+        if name not in _INDICATORS:
+            if name in df.columns:
+                return df[name].to_numpy()
+            raise KeyError(f"Unknown indicator '{name}'")
+        if name in pending:
+            raise ValueError(f"Circular indicator dependency: {' -> '.join(pending + (name,))}")
+        spec = _INDICATORS[name]
+        args = [resolve(dep, pending + (name,)) for dep in spec['inputs']]
+        if not spec['raw']:
+            args = [pd.Series(values, index=df.index) for values in args]
+        # Kept float64 even with COMPACT_FRAMES: narrowing computed values shifts their 2-decimal display
+        values = np.asarray(spec['func'](*args), dtype=np.float64)
+        # Memoized arrays are shared by every frame built from them
+        values.flags.writeable = False
+        memo[name] = values
+        return memo[name]
+
+    return {name: resolve(name) for name in dict.fromkeys(names)}
+
+def with_indicators(df, names, ticker=None):
+    """df with the named indicator columns present, computing only the ones it lacks."""
+    missing = [name for name in names if name not in df.columns]
+    if not missing:
+        return df
+    return df.assign(**get_indicators(df, missing, ticker))
+
+# float32 resolves 2 decimals (spacing <= 0.0078) below this magnitude; larger columns stay float64
+F32_MAX_ABS = 2**16
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+def _compact_float_dtype(values):
+    """
+    float32 when every value is below F32_MAX_ABS and narrows to the same float32 as its
+    whole number of cents (cent prices, or ones already stored as float32), so the narrowed
+    value still prints the same 2 decimals; float64 otherwise (e.g. adjusted prices).
+    """
+    finite = values[~np.isnan(values)]
+    if len(finite) == 0:
+        return np.float32
+    if np.abs(finite).max() >= F32_MAX_ABS or not np.array_equal(np.round(finite, 2).astype(np.float32), finite.astype(np.float32)):
+        return np.float64
+    return np.float32
+
+def freeze_frame(df):
+    """
+    Read-only view of df for sharing through caches: the column arrays are not copied, but any
+    write to them raises instead of silently changing what other sessions see.
+    """
+    columns = {}
+    for i, col in enumerate(df.columns):
+        values = df.iloc[:, i].to_numpy().view()
+        values.flags.writeable = False
+        columns[col] = values
+    frozen = pd.DataFrame(columns, index=df.index, copy=False)
+    frozen.attrs = dict(df.attrs)
+    return frozen
+
+def _compact_volume(volume):
+    """Volume as the narrowest signed integer that holds it, or float if it has gaps/fractions."""
+    values = volume.to_numpy(dtype=np.float64)
+    if len(values) == 0 or np.isnan(values).any() or not np.array_equal(values, np.round(values)):
+        return values.astype(_compact_float_dtype(values))
+    return values.astype(np.int32 if np.abs(values).max() < 2**31 else np.int64)
+
+def compact_frame(df):
+    """
+    Compact layout of a processed frame: float32 prices (where that keeps their 2-decimal
+    values, see _compact_float_dtype), integer Volume, and Close_Lag_* columns as zero-copy
+    views into one NaN-padded Close buffer (so the lags cost max(LAG_PERIODS) extra values
+    instead of a column each). Computed indicators stay float64. Column order and attrs are kept.
+    """
+    n = len(df)
+    max_lag = max(LAG_PERIODS)
+    close_values = df['Close'].to_numpy(dtype=np.float64)
+    close = np.full(n + max_lag, np.nan, dtype=_compact_float_dtype(close_values))
+    close[max_lag:] = close_values
+    columns = {}
+    for col in df.columns:
+        if col == 'Close':
+            columns[col] = close[max_lag:]
+        elif col.startswith('Close_Lag_') and int(col.rsplit('_', 1)[1]) in LAG_PERIODS:
+            lag = int(col.rsplit('_', 1)[1])
+            columns[col] = close[max_lag - lag:max_lag - lag + n]
+        elif col == 'Volume':
+            columns[col] = _compact_volume(df[col])
+        elif col in PRICE_COLUMNS:
+            values = df[col].to_numpy(dtype=np.float64)
+            columns[col] = values.astype(_compact_float_dtype(values), copy=False)
+        else:
+            columns[col] = df[col].to_numpy()
+    # copy=False keeps each array as its own block, which is what lets the lag views share memory
+    compact = pd.DataFrame(columns, index=df.index, copy=False)
+    compact.attrs = dict(df.attrs)
+    return compact
+
+def memory_report(df):
+    """
+    Memory used by a frame, counting buffers shared between columns (the compact lag views)
+    once. Returns {'columns': DataFrame of column/dtype/bytes/shared, 'total_bytes',
+    'float64_bytes' (the same frame with 8-byte columns, unshared), 'saving_pct'}.
+    """
+    rows, buffers, total = [], [], 0
+    for col in df.columns:
+        values = df[col].to_numpy()
+        shared = any(np.shares_memory(values, buf) for buf in buffers)
+        nbytes = int(df[col].memory_usage(index=False, deep=True))
+        if not shared:
+            buffers.append(values)
+            total += nbytes
+        rows.append({'column': col, 'dtype': str(df[col].dtype), 'bytes': nbytes, 'shared': shared})
+    float64_bytes = 8 * len(df) * len(df.columns)
+    return {
+        'columns': pd.DataFrame(rows),
+        'total_bytes': total,
+        'float64_bytes': float64_bytes,
+        'saving_pct': 100 * (1 - total / float64_bytes) if float64_bytes else 0.0,
     }
-    
-    base_ticker = ticker.split('.')[0].upper()
-    info = stock_info.get(base_ticker, {
-        'name': ticker,'sector': 'Unknown','industry': 'Unknown','currency': 'USD'
+
+class IndicatorEngine:
+    """
+    Rolling state behind the process_stock_data indicators for one ticker: running sums for
+    MA_20/MA_50/Volume_MA, running gain/loss sums for RSI and a ring buffer of recent closes
+    for the lags. update() handles one new bar in O(1) and matches the batch columns
+    (calculate_rsi uses simple 14-bar means, so the engine does too).
+    """
+
+    def __init__(self, rsi_window=14):
+        self.rsi_window = rsi_window
+        self.closes = deque(maxlen=50)
+        self.volumes = deque(maxlen=10)
+        self.gains = deque(maxlen=rsi_window)
+        self.losses = deque(maxlen=rsi_window)
+        self.sum_20 = self.sum_50 = self.sum_volume = self.sum_gain = self.sum_loss = 0.0
+
+    def update(self, close, volume):
+        """Add one bar and return its indicator values as a dict keyed by INDICATOR_COLUMNS."""
+        close, volume = float(close), float(volume)
+        prev = self.closes[-1] if self.closes else None
+        if len(self.closes) >= 20:
+            self.sum_20 -= self.closes[-20]
+        if len(self.closes) == self.closes.maxlen:
+            self.sum_50 -= self.closes[0]
+        self.closes.append(close)
+        self.sum_20 += close
+        self.sum_50 += close
+
+        if len(self.volumes) == self.volumes.maxlen:
+            self.sum_volume -= self.volumes[0]
+        self.volumes.append(volume)
+        self.sum_volume += volume
+
+        # Like calculate_rsi, the first bar contributes a zero gain/loss rather than NaN
+        delta = close - prev if prev is not None else 0.0
+        if len(self.gains) == self.rsi_window:
+            self.sum_gain -= self.gains[0]
+            self.sum_loss -= self.losses[0]
+        self.gains.append(max(delta, 0.0))
+        self.losses.append(max(-delta, 0.0))
+        self.sum_gain += self.gains[-1]
+        self.sum_loss += self.losses[-1]
+
+        n = len(self.closes)
+        row = {
+            'MA_20': self.sum_20 / 20 if n >= 20 else np.nan,
+            'MA_50': self.sum_50 / 50 if n >= 50 else np.nan,
+            'RSI': np.nan,
+            'Price_Change': close / prev - 1 if prev is not None else np.nan,
+            'Volume_MA': self.sum_volume / 10 if len(self.volumes) >= 10 else np.nan,
+        }
+        if len(self.gains) == self.rsi_window:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rs = np.float64(self.sum_gain / self.rsi_window) / np.float64(self.sum_loss / self.rsi_window)
+                row['RSI'] = 100 - (100 / (1 + rs))
+        for i in LAG_PERIODS:
+            row[f'Close_Lag_{i}'] = self.closes[-1 - i] if n > i else np.nan
+        return row
+
+    @classmethod
+    def from_frame(cls, df):
+        """Rebuild the state from a frame's last bars (the longest window is 50, plus one for the delta)."""
+        engine = cls()
+        for close, volume in zip(df['Close'].to_numpy()[-51:], df['Volume'].to_numpy()[-51:]):
+            engine.update(close, volume)
+        return engine
+
+def _date_values(df):
+    """df['Date'] as datetime64[ns]; skips pd.to_datetime when the column already is one (it is slow)."""
+    dates = df['Date']
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates)
+    return dates.to_numpy(dtype='datetime64[ns]')
+
+def build_panel(frames, columns=('Close', 'Volume')):
+    """
+    Align {ticker: df} on the union of their dates into dates x tickers float64 arrays.
+    Days a ticker did not trade (other exchange's holidays, before listing) are NaN.
+    Returns (dates, tickers, {column: panel}).
+    """
+    tickers = list(frames)
+    ticker_dates = [_date_values(frames[ticker]) for ticker in tickers]
+    dates = np.unique(np.concatenate(ticker_dates))
+    panels = {column: np.full((len(dates), len(tickers)), np.nan) for column in columns}
+    for j, ticker in enumerate(tickers):
+        rows = np.searchsorted(dates, ticker_dates[j])
+        for column in columns:
+            panels[column][rows, j] = frames[ticker][column].to_numpy(dtype=np.float64)
+    return pd.DatetimeIndex(dates), tickers, panels
+
+def _rolling_mean_dense(values, window):
+    """Rolling mean down axis 0 of an array whose NaNs, if any, are all trailing."""
+    out = np.full(values.shape, np.nan)
+    if len(values) < window:
+        return out
+    cs = np.cumsum(np.nan_to_num(values), axis=0)
+    out[window - 1] = cs[window - 1]
+    out[window:] = cs[window:] - cs[:-window]
+    out[window - 1:] /= window
+    return out
+
+def _shift_dense(values, periods):
+    out = np.full(values.shape, np.nan)
+    out[periods:] = values[:-periods]
+    return out
+
+def compute_panel_indicators(close, volume):
+    """
+    Compute every process_stock_data indicator for a whole dates x tickers panel at once.
+    NaN cells (non-trading days) are skipped rather than poisoning windows: each ticker's
+    bars are packed to the top of a dense array, the windows run there, and the results are
+    scattered back, so a column matches what process_stock_data gives for that ticker alone.
+    Returns {indicator_name: 2-D array shaped like close}.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    traded = ~np.isnan(close)
+    rows, cols = np.nonzero(traded)
+    rank = (np.cumsum(traded, axis=0) - 1)[rows, cols]
+
+    packed_close = np.full(close.shape, np.nan)
+    packed_close[rank, cols] = close[rows, cols]
+    packed_volume = np.full(close.shape, np.nan)
+    packed_volume[rank, cols] = volume[rows, cols]
+
+    delta = np.zeros(close.shape)
+    delta[1:] = np.diff(packed_close, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = _rolling_mean_dense(np.maximum(delta, 0.0), 14) / _rolling_mean_dense(np.maximum(-delta, 0.0), 14)
+        packed = {
+            'MA_20': _rolling_mean_dense(packed_close, 20),
+            'MA_50': _rolling_mean_dense(packed_close, 50),
+            'RSI': 100 - (100 / (1 + rs)),
+            'Price_Change': packed_close / _shift_dense(packed_close, 1) - 1,
+            'Volume_MA': _rolling_mean_dense(packed_volume, 10),
+        }
+    for i in LAG_PERIODS:
+        packed[f'Close_Lag_{i}'] = _shift_dense(packed_close, i)
+
+    indicators = {}
+    for name, values in packed.items():
+        out = np.full(close.shape, np.nan)
+        out[rows, cols] = values[rank, cols]
+        indicators[name] = out
+    return indicators
+
+def process_panel(frames, source=None):
+    """
+    Panel counterpart of process_stock_data for {ticker: df}: one vectorized pass over all
+    tickers. Returns {ticker: processed df} with the same indicator columns.
+    """
+    frames = {ticker: df for ticker, df in frames.items() if df is not None and not df.empty}
+    if not frames:
+        return {}
+    dates, tickers, panels = build_panel(frames, ('Close', 'Volume'))
+    indicators = compute_panel_indicators(panels['Close'], panels['Volume'])
+    dates = dates.to_numpy()
+    processed = {}
+    for j, ticker in enumerate(tickers):
+        base_dates = _date_values(frames[ticker])
+        rows = np.searchsorted(dates, base_dates)
+        derived = pd.DataFrame({name: indicators[name][rows, j] for name in INDICATOR_COLUMNS})
+        df = pd.concat([frames[ticker].reset_index(drop=True).assign(Date=base_dates), derived], axis=1)
+        df.attrs = {'source': source or frames[ticker].attrs.get('source'), 'ticker': ticker, 'last_updated': datetime.now()}
+        processed[ticker] = df
+    return processed
+
+# Bar timeframes derived from the daily series; None means the daily bars themselves
+TIMEFRAMES = {'Daily': None, 'Weekly': 'W', 'Monthly': 'M', 'Quarterly': 'Q'}
+# Trading days per bar and the bar's name, for turning a horizon in days into bars
+TIMEFRAME_BARS = {'Daily': (1, 'Day'), 'Weekly': (5, 'Week'), 'Monthly': (21, 'Month'), 'Quarterly': (63, 'Quarter')}
+
+def bars_for_days(days, timeframe):
+    """Bars of the timeframe needed to cover `days` trading days (rounded up, at least 1)."""
+    return max(1, -(-int(days) // TIMEFRAME_BARS[timeframe][0]))
+
+def _period_keys(dates, timeframe):
+    """Integer id of the week/month/quarter each datetime64[D] date falls in (ids increase with time)."""
+    if timeframe == 'W':
+        # 1970-01-01 was a Thursday: shift by 3 days so weeks run Monday..Sunday
+        return (dates.astype(np.int64) + 3) // 7
+    months = dates.astype('datetime64[M]').astype(np.int64)
+    if timeframe == 'M':
+        return months
+    if timeframe == 'Q':
+        return months // 3
+    raise ValueError(f"Unknown timeframe '{timeframe}'")
+
+def _period_bounds(keys, timeframe):
+    """First and last calendar day (datetime64[D]) of each period id."""
+    if timeframe == 'W':
+        first = (keys * 7 - 3).astype('datetime64[D]')
+        return first, first + np.timedelta64(6, 'D')
+    months = keys * 3 if timeframe == 'Q' else keys
+    span = 3 if timeframe == 'Q' else 1
+    first = months.astype('datetime64[M]').astype('datetime64[D]')
+    last = (months + span).astype('datetime64[M]').astype('datetime64[D]') - np.timedelta64(1, 'D')
+    return first, last
+
+def resample_ohlcv(df, timeframe):
+    """
+    Aggregate daily OHLCV bars into weekly ('W'), monthly ('M') or quarterly ('Q') bars:
+    first Open, max High, min Low, last Close, summed Volume. Each bar is dated by its last
+    trading day. Partial is True for a bar whose period is cut off by the data: the first one
+    when the series starts after the period's first business day, and the last one when the
+    period's last business day has no bar yet (a still-running week/month/quarter).
+    """
+    if timeframe is None:
+        return df
+    dates = _date_values(df).astype('datetime64[D]')
+    if len(dates) == 0:
+        return df.iloc[:0].assign(Partial=pd.Series(dtype=bool))
+    keys = _period_keys(dates, timeframe)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(dates)] - 1
+
+    first_day, last_day = _period_bounds(keys[starts], timeframe)
+    partial = np.zeros(len(starts), dtype=bool)
+    partial[0] |= dates[0] > np.busday_offset(first_day[0], 0, roll='forward')
+    partial[-1] |= dates[-1] < np.busday_offset(last_day[-1], 0, roll='backward')
+
+    out = pd.DataFrame({
+        'Date': dates[ends].astype('datetime64[ns]'),
+        'Open': df['Open'].to_numpy(dtype=np.float64)[starts],
+        'High': np.maximum.reduceat(df['High'].to_numpy(dtype=np.float64), starts),
+        'Low': np.minimum.reduceat(df['Low'].to_numpy(dtype=np.float64), starts),
+        'Close': df['Close'].to_numpy(dtype=np.float64)[ends],
+        'Volume': np.add.reduceat(df['Volume'].to_numpy(dtype=np.float64), starts),
+        'Partial': partial,
     })
+    out.attrs = dict(df.attrs)
+    return out
+
+# Last resampled frame per (ticker, timeframe): {key: (daily_rows, first_date, last_date, last_close, bars)}
+_RESAMPLED = {}
+_RESAMPLED_LOCK = threading.Lock()
+
+def resample_incremental(df, ticker, timeframe):
+    """
+    resample_ohlcv with reuse: when df is the previously resampled daily series plus newly
+    appended bars, only the daily bars of the last (possibly partial) period onwards are
+    re-aggregated and spliced onto the earlier, finished periods. df may also start later
+    than before (a rolling period window): the periods it no longer reaches are dropped
+    and its new first period is re-aggregated.
+    """
+    if timeframe is None or df is None or df.empty:
+        return df
+    key = (ticker, timeframe)
+    dates = _date_values(df)
+    with _RESAMPLED_LOCK:
+        prev = _RESAMPLED.get(key)
+        if prev is not None:
+            n_prev, first_date, last_date, last_close, bars = prev
+            seam = int(np.searchsorted(dates, last_date))
+            bar_keys = _period_keys(bars['Date'].to_numpy().astype('datetime64[D]'), timeframe)
+            first_key = _period_keys(dates[:1].astype('datetime64[D]'), timeframe)[0]
+            if (len(bars) > 1 and dates[0] >= first_date and seam < len(dates) and dates[seam] == last_date
+                    and df['Close'].iloc[seam] == last_close and first_key < bar_keys[-1]):
+                period_first = _period_bounds(bar_keys[-1:], timeframe)[0][0]
+                tail = resample_ohlcv(df.iloc[int(np.searchsorted(dates, period_first.astype('datetime64[ns]'))):], timeframe)
+                # Only the series' own first bar can start partway through its period
+                tail['Partial'] = tail['Partial'].to_numpy() & (np.arange(len(tail)) == len(tail) - 1)
+                parts = [bars[(bar_keys >= first_key) & (bar_keys < bar_keys[-1])], tail]
+                if dates[0] != first_date:
+                    head_end = int(np.searchsorted(_period_keys(dates.astype('datetime64[D]'), timeframe), first_key, side='right'))
+                    head = resample_ohlcv(df.iloc[:head_end], timeframe)
+                    head['Partial'] = dates[0].astype('datetime64[D]') > np.busday_offset(_period_bounds(np.array([first_key]), timeframe)[0][0], 0, roll='forward')
+                    parts = [head, bars[(bar_keys > first_key) & (bar_keys < bar_keys[-1])], tail]
+                result = pd.concat(parts, ignore_index=True)
+                result.attrs = dict(df.attrs)
+                _RESAMPLED[key] = (len(df), dates[0], dates[-1], df['Close'].iloc[-1], result)
+                return result
+        result = resample_ohlcv(df, timeframe)
+        _RESAMPLED[key] = (len(df), dates[0], dates[-1], df['Close'].iloc[-1], result)
+        return result
+
+# Last processed frame and its engine per ticker: {ticker: (engine, processed_df)}
+# Rows after which the INDICATOR_COLUMNS values no longer depend on where the series starts
+# (MA_50 is the longest window)
+WARMUP_BARS = 50
+_ENGINES = {}
+_ENGINES_LOCK = threading.Lock()
+
+def process_stock_data_incremental(df, ticker, source):
+    """
+    Same result as process_stock_data, but when the ticker's last processed frame is a prefix
+    of df (the same history plus newly appended bars) only the new bars are computed. df may
+    also start later than the last frame (a rolling period window): only the first
+    WARMUP_BARS rows, whose windows no longer reach the dropped bars, are recomputed.
+    The returned frame is read-only and shared with later calls; use .copy() to modify it.
+    """
+    if df is None or df.empty:
+        return None
+    if 'Date' not in df.columns and df.index.name == 'Date':
+        df = df.reset_index()
+
+    with _ENGINES_LOCK:
+        engine, prev = _ENGINES.get(ticker, (None, None))
+        offset = int(prev['Date'].searchsorted(pd.Timestamp(df['Date'].iloc[0]))) if prev is not None else 0
+        n_kept = len(prev) - offset if prev is not None else 0
+        is_extension = (
+            prev is not None and 0 < n_kept <= len(df)
+            and pd.Timestamp(df['Date'].iloc[0]) == prev['Date'].iloc[offset]
+            and pd.Timestamp(df['Date'].iloc[n_kept - 1]) == prev['Date'].iloc[-1]
+            # Compare at float32 precision, which is what compact frames store
+            and np.float32(df['Close'].iloc[n_kept - 1]) == np.float32(prev['Close'].iloc[-1])
+            and (offset == 0 or n_kept > WARMUP_BARS)
+        )
+        if not is_extension:
+            result = process_stock_data(df, ticker, source)
+            _ENGINES[ticker] = (IndicatorEngine.from_frame(df), result)
+            return result
+
+        parts = [prev]
+        if offset:
+            parts = [process_stock_data(df.iloc[:WARMUP_BARS], ticker, source), prev.iloc[offset + WARMUP_BARS:]]
+        new_bars = df.iloc[n_kept:].reset_index(drop=True)
+        rows = [engine.update(close, volume) for close, volume in zip(new_bars['Close'], new_bars['Volume'])]
+        if rows:
+            new_bars['Date'] = pd.to_datetime(new_bars['Date'])
+            parts.append(pd.concat([new_bars, pd.DataFrame(rows, columns=INDICATOR_COLUMNS)], axis=1))
+        result = pd.concat(parts, ignore_index=True) if len(parts) > 1 else prev
+        if config.COMPACT_FRAMES and len(parts) > 1:
+            result = compact_frame(result)
+        result = freeze_frame(result)
+        result.attrs = {'source': source, 'ticker': ticker, 'last_updated': datetime.now()}
+        _ENGINES[ticker] = (engine, result)
+        return result
+
+def get_stock_info(ticker):
+    """Catalog metadata for a ticker; unknown tickers get a placeholder priced in their exchange's currency."""
+    record = catalog.lookup(ticker)
+    if record is not None:
+        info = {key: record[key] for key in ('name', 'sector', 'industry', 'currency', 'exchange')}
+    else:
+        indian = catalog.normalize_symbol(ticker).endswith('.NSE')
+        info = {'name': ticker, 'sector': 'Unknown', 'industry': 'Unknown', 'currency': 'INR' if indian else 'USD', 'exchange': 'NSE' if indian else 'Unknown'}
     info['market_cap'] = 'N/A'
     return info
 
@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+import config
+
+# Split ratios recognised in close-to-close jumps (2:1, 3:1, ... and the reverse splits)
+SPLIT_RATIOS = (2, 3, 4, 5, 10, 20)
+SPLIT_TOLERANCE = 0.03
+# Bars on each side of a jump whose median volumes are compared to corroborate a split
+SPLIT_VOLUME_BARS = 5
+
+def split_factors(close):
+    """
+    Per-bar price factor for split-like jumps: 1/k where close[t]/close[t-1] is within
+    SPLIT_TOLERANCE of 1/k (a k-for-1 split), k where it is near k (a reverse split), else 1.
+    """
+    factors = np.ones(len(close))
+    if len(close) < 2:
+        return factors
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = close[1:] / close[:-1]
+    for k in SPLIT_RATIOS:
+        factors[1:][np.abs(ratio * k - 1) < SPLIT_TOLERANCE] = 1.0 / k
+        factors[1:][np.abs(ratio / k - 1) < SPLIT_TOLERANCE] = float(k)
+    return factors
+
+def confirmed_splits(open_, close, volume, factors):
+    """
+    Mask of the split-like jumps in factors (from split_factors) that the rest of the data
+    corroborates, as a real k-for-1 split (factor 1/k) both gaps the open and multiplies the
+    traded share count: the open is within SPLIT_TOLERANCE of the previous close times the
+    factor, and the median volume of up to SPLIT_VOLUME_BARS bars after the jump, over the
+    median before it, is nearer k than 1 on a log scale. A crash or rally that happens to land
+    near a split ratio fails one of the two.
+    """
+    confirmed = np.zeros(len(factors), dtype=bool)
+    for i in np.flatnonzero(factors != 1.0):
+        gap = open_[i] / close[i - 1] / factors[i]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = np.log(np.median(volume[i:i + SPLIT_VOLUME_BARS]) / np.median(volume[max(0, i - SPLIT_VOLUME_BARS):i]))
+        expected = -np.log(factors[i])
+        confirmed[i] = abs(gap - 1) < SPLIT_TOLERANCE and bool(np.sign(volume_ratio) == np.sign(expected)) and abs(volume_ratio) > abs(expected) / 2
+    return confirmed
+
+def validate_ohlcv(df, market="US", adjust_splits=False):
+    """
+    Check and repair a normalized Date/Open/High/Low/Close/Volume frame with vectorized masks.
+    Returns (clean_df, report):
+    - duplicate dates: the last bar of each date is kept
+    - missing, zero or negative prices: the bar is dropped
+    - ghost bars (zero volume with Open == High == Low == Close, e.g. holiday placeholders): dropped
+    - High/Low that do not bound Open/Close (including High < Low): High and Low are widened
+    - zero volume on a real bar: counted
+    - gaps: consecutive bars more than one trading session apart on the market's calendar: counted
+    - split-like jumps: counted; with adjust_splits (unadjusted sources) earlier bars are
+      back-adjusted by the split ratio where the open gap and volume confirm a split
+      (confirmed_splits), and left as they are otherwise
+    """
+    rows_in = len(df)
+    dates = df['Date'].to_numpy(dtype='datetime64[ns]')
+    order = np.argsort(dates, kind='stable')
+    dates = dates[order]
+    keep = np.ones(rows_in, dtype=bool)
+    keep[:-1] = dates[:-1] != dates[1:]
+    duplicates = int(rows_in - keep.sum())
+
+    prices = df[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=np.float64)[order]
+    volume = df['Volume'].to_numpy(dtype=np.float64)[order]
+    valid = np.isfinite(prices).all(axis=1) & (prices > 0).all(axis=1)
+    ghost = valid & (volume == 0) & (prices == prices[:, :1]).all(axis=1)
+    invalid_prices = int((keep & ~valid).sum())
+    ghost_bars = int((keep & ghost).sum())
+    keep &= valid & ~ghost
+
+    prices, volume, dates = prices[keep], volume[keep], dates[keep]
+    high = prices.max(axis=1)
+    low = prices.min(axis=1)
+    ohlc_fixed = int(((high != prices[:, 1]) | (low != prices[:, 2])).sum())
+    prices[:, 1], prices[:, 2] = high, low
+
+    holidays = config.MARKET_HOLIDAYS.get(market, [])
+    days = dates.astype('datetime64[D]')
+    missing = np.busday_count(days[:-1], days[1:], holidays=holidays) - 1 if len(days) > 1 else np.zeros(0, dtype=np.int64)
+    missing = np.maximum(missing, 0)
+
+    factors = split_factors(prices[:, 3])
+    jumps = np.flatnonzero(factors != 1.0)
+    adjusted = jumps[confirmed_splits(prices[:, 0], prices[:, 3], volume, factors)[jumps]] if adjust_splits else jumps[:0]
+    if len(adjusted):
+        # Every bar before a confirmed split is scaled by it: reverse cumulative product of the factors
+        scale = np.ones(len(factors))
+        scale[adjusted - 1] = factors[adjusted]
+        scale = np.cumprod(scale[::-1])[::-1]
+        prices *= scale[:, None]
+        volume = volume / scale
+
+    clean = pd.DataFrame({
+        'Date': dates,
+        'Open': prices[:, 0], 'High': prices[:, 1], 'Low': prices[:, 2], 'Close': prices[:, 3],
+        'Volume': volume,
+    })
+    clean.attrs = dict(df.attrs)
+    report = {
+        'rows_in': rows_in,
+        'rows_out': len(clean),
+        'duplicates': duplicates,
+        'invalid_prices': invalid_prices,
+        'ghost_bars': ghost_bars,
+        'ohlc_fixed': ohlc_fixed,
+        'zero_volume': int((volume == 0).sum()),
+        'gaps': int((missing > 0).sum()),
+        'missing_sessions': int(missing.sum()),
+        'split_jumps': [(str(days[i]), float(factors[i])) for i in jumps],
+        'splits_adjusted': [str(days[i]) for i in adjusted],
+    }
+    return clean, report
+
+def window_report(report, df, market="US"):
+    """
+    The ingestion report narrowed to df, an already-validated slice of the frame it describes:
+    bar, volume and gap counts are recomputed over df, split jumps are kept when they fall in
+    it, and the repair counts (which cannot be attributed to dates) are dropped.
+    """
+    _, window = validate_ohlcv(df, market)
+    first_day = str(df['Date'].iloc[0].date()) if len(df) else ""
+    window['split_jumps'] = [(day, factor) for day, factor in report['split_jumps'] if day >= first_day]
+    window['splits_adjusted'] = [day for day in report['splits_adjusted'] if day >= first_day]
+    if 'seam_factor' in report:
+        window['seam_factor'] = report['seam_factor']
+    return window
+
+def summarize(report):
+    """One-line report for the API status trace: starts with ✅ when nothing was found."""
+    issues = []
+    if report['duplicates']:
+        issues.append(f"{report['duplicates']} duplicate dates removed")
+    if report['invalid_prices']:
+        issues.append(f"{report['invalid_prices']} bars with missing/non-positive prices dropped")
+    if report['ghost_bars']:
+        issues.append(f"{report['ghost_bars']} zero-volume placeholder bars dropped")
+    if report['ohlc_fixed']:
+        issues.append(f"{report['ohlc_fixed']} bars with inconsistent High/Low repaired")
+    if report['zero_volume']:
+        issues.append(f"{report['zero_volume']} zero-volume bars")
+    if report['gaps']:
+        issues.append(f"{report['gaps']} gaps ({report['missing_sessions']} missing sessions)")
+    if report['split_jumps']:
+        jumps = ", ".join(f"{day} ×{factor:g}" for day, factor in report['split_jumps'][:3])
+        adjusted = len(report['splits_adjusted'])
+        action = "left as is" if not adjusted else "back-adjusted" if adjusted == len(report['split_jumps']) else f"{adjusted} back-adjusted, the rest unconfirmed and left as is"
+        issues.append(f"{len(report['split_jumps'])} split-like jumps {action} ({jumps})")
+    if report.get('seam_factor', 1.0) != 1.0:
+        issues.append(f"stored history rescaled ×{report['seam_factor']:.4g} to match the appended bars (split or re-adjustment at the seam)")
+    if not issues:
+        return f"✅ Data quality: {report['rows_out']} bars passed all checks"
+    return f"⚠️ Data quality: {report['rows_out']} of {report['rows_in']} bars kept; " + "; ".join(issues)
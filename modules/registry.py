@@ -0,0 +1,127 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+import numpy as np
+import joblib
+import config
+
+# Loaded entries, most recently used last: {(ticker, key): entry}
+_LOADED = OrderedDict()
+_LOCK = threading.Lock()
+
+def _digest(*chunks):
+    h = hashlib.blake2b(digest_size=12)
+    for chunk in chunks:
+        h.update(chunk)
+    return h.hexdigest()
+
+def params_hash(params):
+    return _digest(json.dumps(params, sort_keys=True, default=str).encode())
+
+def model_key(X, y, params):
+    """
+    Content address of a training run: a hash of the feature names and values, the target and
+    the hyperparameters. The same data and settings always give the same key, and any new or
+    revised bar gives a new one.
+    """
+    features = _digest(
+        json.dumps(list(X.columns)).encode(),
+        np.ascontiguousarray(X.to_numpy(dtype=np.float64)).tobytes(),
+        np.ascontiguousarray(np.asarray(y, dtype=np.float64)).tobytes(),
+    )
+    return f"{features}-{params_hash(params)}"
+
+def _path(ticker, key):
+    return os.path.join(config.MODEL_REGISTRY_DIR, ticker.replace('/', '_').upper(), f"{key}.joblib")
+
+def exists(ticker, key):
+    return os.path.exists(_path(ticker, key))
+
+def load(ticker, key):
+    """
+    The registry entry for (ticker, key) or None. Entries are read with mmap_mode='r', so the
+    fitted arrays are mapped from the file rather than unpickled into fresh memory.
+    """
+    with _LOCK:
+        entry = _LOADED.get((ticker, key))
+        if entry is not None:
+            _LOADED.move_to_end((ticker, key))
+            return entry
+    path = _path(ticker, key)
+    if not os.path.exists(path):
+        return None
+    try:
+        entry = joblib.load(path, mmap_mode='r')
+    except Exception as e:
+        print(f"Error loading model {path}: {e}")
+        return None
+    _remember(ticker, key, entry)
+    return entry
+
+def latest(ticker, params):
+    """The most recently stored entry for the ticker trained with these hyperparameters, or None."""
+    suffix = f"-{params_hash(params)}"
+    for _, key, _, _, _ in list_models(ticker):
+        if key.endswith(suffix):
+            return load(ticker, key)
+    return None
+
+def save(ticker, key, entry):
+    """Write an entry (model, scaler, metrics, feature_importance, ...) atomically and keep it loaded."""
+    entry = dict(entry, ticker=ticker, key=key, trained_at=datetime.now().isoformat())
+    path = _path(ticker, key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        joblib.dump(entry, tmp_path)
+        os.replace(tmp_path, path)
+        _prune(ticker)
+    except Exception as e:
+        print(f"Error saving model {path}: {e}")
+    _remember(ticker, key, entry)
+    return entry
+
+def _prune(ticker):
+    """
+    Drop a ticker's entries beyond config.MODEL_REGISTRY_KEEP per hyperparameter hash, so
+    forecasters for many horizons never push the current price model out, then the oldest
+    non-newest entries beyond config.MODEL_REGISTRY_MAX_PER_TICKER.
+    """
+    seen, newest, older = {}, [], []
+    for _, key, path, _, _ in list_models(ticker):
+        kind = key.rpartition('-')[2]
+        seen[kind] = seen.get(kind, 0) + 1
+        if seen[kind] > config.MODEL_REGISTRY_KEEP:
+            os.remove(path)
+        else:
+            (newest if seen[kind] == 1 else older).append(path)
+    for path in older[max(0, config.MODEL_REGISTRY_MAX_PER_TICKER - len(newest)):]:
+        os.remove(path)
+
+def _remember(ticker, key, entry):
+    with _LOCK:
+        _LOADED[(ticker, key)] = entry
+        _LOADED.move_to_end((ticker, key))
+        while len(_LOADED) > config.MODEL_MEMO_SIZE:
+            _LOADED.popitem(last=False)
+
+def list_models(ticker=None):
+    """[(ticker, key, path, size_bytes, modified)] for the stored entries, newest first."""
+    root = config.MODEL_REGISTRY_DIR
+    if not os.path.isdir(root):
+        return []
+    tickers = [ticker.replace('/', '_').upper()] if ticker else sorted(os.listdir(root))
+    models = []
+    for name in tickers:
+        folder = os.path.join(root, name)
+        if not os.path.isdir(folder):
+            continue
+        for file_name in os.listdir(folder):
+            if file_name.endswith('.joblib'):
+                path = os.path.join(folder, file_name)
+                stat = os.stat(path)
+                models.append((name, file_name[:-len('.joblib')], path, stat.st_size, datetime.fromtimestamp(stat.st_mtime)))
+    return sorted(models, key=lambda m: m[4], reverse=True)
@@ -0,0 +1,81 @@
+import streamlit as st
+import threading
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import config
+from modules import data_fetcher, training
+
+_STATUS = {}
+_STATUS_LOCK = threading.Lock()
+
+def get_prefetch_tickers():
+    """RELIABLE_TICKERS plus the configured watchlist, grouped by market."""
+    tickers = data_fetcher.get_universe_tickers() + list(config.PREFETCH_WATCHLIST)
+    by_market = {market: [] for market in config.MARKET_SESSIONS}
+    for ticker in dict.fromkeys(tickers):
+        by_market.setdefault(data_fetcher.market_for_ticker(ticker), []).append(ticker)
+    return by_market
+
+def seconds_until_refresh(market, now=None):
+    """
+    Delay before the market's tickers should be refreshed again: PREFETCH_AGGRESSIVE_INTERVAL
+    inside the window after a close (when vendors publish the final daily bar), otherwise
+    PREFETCH_IDLE_INTERVAL, but never sleeping through the next close.
+    """
+    now = now or datetime.now(ZoneInfo("UTC"))
+    since_close = (now - data_fetcher.last_session_close(market, now)).total_seconds()
+    if since_close < config.PREFETCH_AFTER_CLOSE_WINDOW:
+        return config.PREFETCH_AGGRESSIVE_INTERVAL
+    until_close = (data_fetcher.next_session_close(market, now) - now).total_seconds()
+    return max(1.0, min(config.PREFETCH_IDLE_INTERVAL, until_close))
+
+def _refresh_market(market, tickers):
+    start = time.monotonic()
+    try:
+        refreshed = data_fetcher.warm_store(tickers, config.PREFETCH_PERIOD)
+        error = None
+    except Exception as e:
+        refreshed, error = [], str(e)
+        print(f"Error prefetching {market} tickers: {e}")
+    training_summary = None
+    if config.PREFETCH_TRAIN_MODELS and refreshed:
+        try:
+            _, training_summary = training.train_universe(refreshed)
+        except Exception as e:
+            print(f"Error training {market} models: {e}")
+    with _STATUS_LOCK:
+        _STATUS[market] = {
+            'last_run': datetime.now(),
+            'tickers': len(tickers),
+            'refreshed': len(refreshed),
+            'seconds': time.monotonic() - start,
+            'error': error,
+            'training': training_summary,
+        }
+
+def _run(stop_event):
+    next_due = {market: 0.0 for market in get_prefetch_tickers()}
+    while not stop_event.is_set():
+        by_market = get_prefetch_tickers()
+        for market, tickers in by_market.items():
+            if tickers and time.monotonic() >= next_due.get(market, 0.0):
+                _refresh_market(market, tickers)
+                next_due[market] = time.monotonic() + seconds_until_refresh(market)
+        stop_event.wait(max(1.0, min(next_due.values()) - time.monotonic()))
+
+@st.cache_resource
+def start_prefetch_scheduler():
+    """
+    Start the background cache-warming thread once per server process (st.cache_resource
+    makes every session share it). Returns a handle with the thread and its stop event.
+    """
+    stop_event = threading.Event()
+    thread = threading.Thread(target=_run, args=(stop_event,), name="aether-prefetch", daemon=True)
+    thread.start()
+    return {'thread': thread, 'stop': stop_event}
+
+def get_prefetch_status():
+    """Last refresh per market: time, tickers refreshed, duration and error (if any)."""
+    with _STATUS_LOCK:
+        return {market: dict(status) for market, status in _STATUS.items()}
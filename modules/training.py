@@ -0,0 +1,120 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+import config
+from modules import data_fetcher, processing, model, registry, backtest
+
+# Stacked feature matrices (target in the last column) for the pool workers
+_SHARED = {}
+
+def _attach(name, shape):
+    shm = shared_memory.SharedMemory(name=name)
+    _SHARED['shm'] = shm
+    _SHARED['data'] = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+def _train_one(task):
+    """Fit one ticker's rows of the shared block and write the entry to the registry from the worker."""
+    ticker, key, start, stop, feature_names, params, n_jobs, span = task
+    t0 = time.monotonic()
+    data = _SHARED['data'][start:stop]
+    entry = model.train_entry(data[:, :-1], data[:, -1], feature_names, params, n_jobs, span)
+    registry.save(ticker, key, entry)
+    return ticker, time.monotonic() - t0, entry['metrics']
+
+def pool_sizes(n_tasks, workers=None, n_jobs=None):
+    """
+    (worker processes, forest n_jobs per worker) with workers x n_jobs <= the CPU count, so
+    concurrent forests do not oversubscribe the cores.
+    """
+    cpus = os.cpu_count() or 1
+    workers = max(1, min(workers or config.BATCH_TRAIN_WORKERS or cpus, n_tasks, cpus))
+    n_jobs = max(1, min(n_jobs or config.BATCH_TRAIN_N_JOBS or cpus // workers, cpus // workers))
+    return workers, n_jobs
+
+def train_universe(tickers=None, period=None, params=None, workers=None, n_jobs=None, force=False):
+    """
+    Fit the price model for every ticker (default: config.RELIABLE_TICKERS) into the model
+    registry, so the app's first Predict click of the day is a registry hit. Data loads and
+    feature preparation run here; the fits run in a process pool reading all feature
+    matrices from one shared-memory block. Tickers whose (data, params) key is already
+    registered are skipped unless force is set.
+    Returns (report, summary): per-ticker status, rows and seconds spent loading, preparing
+    and fitting, plus overall wall time and pool sizes.
+    """
+    t_start = time.monotonic()
+    tickers = list(dict.fromkeys(tickers or data_fetcher.get_universe_tickers()))
+    period = period or config.BATCH_TRAIN_PERIOD
+    params = dict(model.MODEL_PARAMS, **(params or {}))
+
+    report = {}
+    prepared = []
+    for ticker in tickers:
+        row = report[ticker] = {'ticker': ticker, 'status': 'pending', 'rows': 0, 'load_s': 0.0, 'features_s': 0.0, 'fit_s': 0.0, 'test_r2': np.nan}
+        t0 = time.monotonic()
+        try:
+            df, source, _ = data_fetcher.load_stock_data_auto(ticker, period)
+            row['load_s'] = time.monotonic() - t0
+            if source == "sample_data":
+                row['status'] = 'no data'
+                continue
+            t0 = time.monotonic()
+            # Same processing as the app, so the registry keys match its Predict clicks
+            df = processing.process_stock_data_incremental(df, ticker, source)
+            X, y, feature_names, dates, key = model.training_set(df, ticker, params, data_fetcher.read_store(ticker))
+            row['features_s'] = time.monotonic() - t0
+            row['rows'] = len(X)
+        except Exception as e:
+            row['status'] = f'failed: {e}'
+            continue
+        if not force and registry.exists(ticker, key):
+            row['status'] = 'cached'
+            continue
+        block = np.column_stack([X.to_numpy(dtype=np.float64), y.to_numpy(dtype=np.float64)])
+        prepared.append((ticker, key, block, feature_names, (dates[0], dates[-1])))
+
+    workers, n_jobs = pool_sizes(len(prepared), workers, n_jobs)
+    if prepared:
+        data = np.concatenate([block for _, _, block, _, _ in prepared])
+        tasks, start = [], 0
+        for ticker, key, block, feature_names, span in prepared:
+            tasks.append((ticker, key, start, start + len(block), feature_names, params, n_jobs, span))
+            start += len(block)
+        shm = shared_memory.SharedMemory(create=True, size=data.nbytes)
+        try:
+            np.ndarray(data.shape, dtype=np.float64, buffer=shm.buf)[:] = data
+            with ProcessPoolExecutor(max_workers=workers, mp_context=backtest.pool_context([__name__]),
+                                     initializer=_attach, initargs=(shm.name, data.shape)) as executor:
+                futures = {executor.submit(_train_one, task): task[0] for task in tasks}
+                for future in as_completed(futures):
+                    row = report[futures[future]]
+                    try:
+                        _, row['fit_s'], metrics = future.result()
+                        row['status'] = 'trained'
+                        row['test_r2'] = metrics['test_r2']
+                    except Exception as e:
+                        row['status'] = f'failed: {e}'
+        finally:
+            shm.close()
+            shm.unlink()
+
+    report = pd.DataFrame(list(report.values()))
+    summary = {
+        'tickers': len(tickers),
+        'trained': int((report['status'] == 'trained').sum()),
+        'cached': int((report['status'] == 'cached').sum()),
+        'failed': int((~report['status'].isin(['trained', 'cached'])).sum()),
+        'workers': workers,
+        'n_jobs': n_jobs,
+        'fit_s': float(report['fit_s'].sum()),
+        'wall_s': time.monotonic() - t_start,
+    }
+    return report, summary
+
+if __name__ == "__main__":
+    import sys
+    report, summary = train_universe(sys.argv[1:] or None)
+    print(report.to_string(index=False))
+    print(summary)
@@ -327,7 +327,7 @@ def display_welcome_screen():
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from modules import processing
+from modules import processing, catalog
 import config
 import plotly.express as px
 import os
@@ -380,18 +380,31 @@ def get_user_inputs():
     )
 
     if market != "Custom Ticker":
-        stock_options = config.RELIABLE_TICKERS[market]
-        selected_stock = st.selectbox("Select Stock", list(stock_options.keys()))
-        ticker = selected_stock
-        st.info(f"📊 Selected: {stock_options[selected_stock]}")
+        ticker = st.selectbox("Select Stock", config.RELIABLE_TICKERS[market])
+        record = catalog.lookup(ticker)
+        st.info(f"📊 Selected: {record['name'] if record else ticker}")
     else:
         ticker = st.text_input(
             "Enter Stock Ticker",
             value="AAPL",
-            help="Examples: AAPL (US), RELIANCE.NSE (Indian stocks with .NSE extension)"
+            help="Type a symbol or company name. Examples: AAPL (US), RELIANCE.NSE (Indian stocks with .NSE extension)"
         )
         if ticker:
-            if ticker.endswith('.NSE'):
+            ticker = ticker.strip().upper()
+            matches = catalog.search(ticker)
+            if matches and catalog.lookup(ticker) is None:
+                # Not in the catalog (which is far from a full listing): keep what was typed as the
+                # default and offer the closest catalog entries as suggestions only
+                options = [ticker] + [m['symbol'] for m in matches]
+                names = {m['symbol']: m['name'] for m in matches}
+                ticker = st.selectbox("Matching symbols", options, index=0,
+                                      format_func=lambda s: f"{s} — {names[s]}" if s in names else f"{s} (as typed)")
+            record = catalog.lookup(ticker)
+            if record is not None:
+                # Fetch under the catalog's symbol: a plain 'RELIANCE' becomes 'RELIANCE.NSE'
+                ticker = record['symbol']
+                st.info(f"📊 {record['name']} · {record['exchange']} · {record['currency']}")
+            elif ticker.endswith('.NSE'):
                 st.info("🇮🇳 Indian stock format detected")
             else:
                 st.info("🇺🇸 US stock format detected")
@@ -399,16 +412,25 @@ def get_user_inputs():
     st.markdown("#### 📅 Time Period")
     period = st.selectbox(
         "Select Period",
-        ["1mo", "3mo", "6mo", "1y", "2y", "5y"],
+        ["1mo", "3mo", "6mo", "1y", "2y", "5y", "10y"],
         index=3,
         help="Choose the historical data period for analysis"
     )
+    timeframe = st.selectbox(
+        "Bar Size",
+        list(processing.TIMEFRAMES),
+        index=0,
+        help="Weekly, monthly and quarterly bars are built from the stored daily history, so they need no extra download"
+    )
 
     st.markdown("#### 🔮 Prediction Settings")
-    prediction_days = st.slider("Days to Predict", 1, 30, 7, help="Number of days to predict into the future")
+    prediction_days = st.slider("Days to Predict", 1, 30, 7, help="Trading days to predict into the future; on weekly, monthly and quarterly bars this is rounded up to whole bars")
+    backtest_folds = st.slider("Backtest Folds", 0, 250, 0, step=10, help="Walk-forward folds to evaluate in Model Performance (0 = off)")
+    backtest_window = st.radio("Backtest Window", ["Expanding", "Rolling"], horizontal=True,
+                               help="Expanding retrains on all earlier bars; rolling on a fixed-length recent window")
     predict_button = st.button("🚀 Predict Stock Price", type="primary", use_container_width=True)
 
-    return data_source_choice, ticker, period, prediction_days, predict_button
+    return data_source_choice, ticker, period, timeframe, prediction_days, backtest_folds, backtest_window.lower(), predict_button
 
 def display_api_status(trace):
     st.markdown("#### 🔎 API Call Status")
@@ -416,6 +438,19 @@ def display_api_status(trace):
         css_class = "api-working" if "✅" in msg else "api-failed"
         st.markdown(f'<div class="api-status {css_class}">{msg}</div>', unsafe_allow_html=True)
 
+def display_http_stats(stats):
+    hosts = stats.get('hosts', {})
+    if not hosts:
+        return
+    st.markdown("#### 🔌 HTTP Connection Pool")
+    for host, host_stats in hosts.items():
+        st.write(f"- {host}: {host_stats['requests']} requests over {host_stats['connections_opened']} connections ({host_stats['connections_reused']} reused)")
+
+def display_memory_report(report):
+    with st.expander("🧠 Frame Memory"):
+        st.caption(f"{report['total_bytes'] / 1024:,.1f} KB in memory vs {report['float64_bytes'] / 1024:,.1f} KB as float64 ({report['saving_pct']:.0f}% saved); shared columns are zero-copy views")
+        st.dataframe(report['columns'], use_container_width=True, hide_index=True)
+
 def display_stock_analysis(df, ticker, stock_info, currency_symbol, current_price_val, price_change, pct_change, volume, volatility):
     st.markdown(f"### 📋 {stock_info['name']} ({ticker})")
     data_source = df.attrs.get('source')
@@ -466,6 +501,9 @@ def display_prediction_metrics(metrics):
         st.metric("RMSE", f"{metrics['test_rmse']:.2f}")
     with col3:
         st.metric("MAE", f"{metrics['test_mae']:.2f}")
+    if metrics.get('updates'):
+        st.caption(f"♻️ Warm-started with new bars: {metrics['updates']} incremental update(s) since the last full retrain "
+                   f"(RMSE on the new bars before updating: {metrics['recent_rmse']:.2f})")
 
 def display_next_day_prediction(prediction, df, currency_symbol):
     st.markdown("### 🔮 Next Day Prediction")
@@ -492,6 +530,22 @@ def display_next_day_prediction(prediction, df, currency_symbol):
         except Exception:
             st.error("Could not display prediction metrics.")
 
+def display_forecast(forecast, df, currency_symbol, bar_name="Day"):
+    st.markdown(f"### 📅 {len(forecast)}-{bar_name} Forecast")
+    current_price_num = float(df['Close'].iloc[-1])
+    final_price = float(forecast['Predicted_Close'].iloc[-1])
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Forecast End Price", f"{currency_symbol}{final_price:.2f}", f"{currency_symbol}{final_price - current_price_num:.2f}")
+    with col2:
+        st.metric("Forecast High", f"{currency_symbol}{forecast['Predicted_Close'].max():.2f}")
+    with col3:
+        st.metric("Forecast Low", f"{currency_symbol}{forecast['Predicted_Close'].min():.2f}")
+    display_forecast_df = forecast.copy()
+    display_forecast_df['Date'] = display_forecast_df['Date'].dt.strftime('%Y-%m-%d')
+    with st.expander("📋 Forecast Table"):
+        st.dataframe(display_forecast_df.round(2), use_container_width=True, hide_index=True)
+
 def display_model_performance(metrics, feature_importance):
     if metrics is not None:
         st.markdown("### 🤖 Model Performance Details")
@@ -532,8 +586,29 @@ def display_model_performance(metrics, feature_importance):
             - **RSI**: Relative Strength Index (momentum indicator)
             - **Volume**: Trading volume
             - **Price_Change**: Recent price change percentage
+            - **EMA_X / MACD**: Exponential averages and their spread (trend momentum)
+            - **BB_Upper / BB_Lower**: Bollinger Bands (volatility envelope)
+            - **ATR / OBV / VWAP**: Average True Range, On-Balance Volume, volume-weighted price
             """)
 
+def display_backtest(folds, summary):
+    if folds is None or folds.empty:
+        st.warning("⚠️ Not enough data for a walk-forward backtest.")
+        return
+    st.markdown("### 🔁 Walk-Forward Backtest")
+    st.caption(f"{summary['folds']} {summary['window']} folds, {summary['test_rows']} out-of-sample bars, {summary['workers']} worker process(es)")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("RMSE", f"{summary['rmse']:.4f}")
+    col2.metric("MAE", f"{summary['mae']:.4f}")
+    col3.metric("R² Score", f"{summary['r2']:.4f}")
+    col4.metric("Direction Hit Rate", f"{summary['hit_rate']:.1%}")
+    fig = px.line(folds, x='test_start', y=['rmse', 'mae'], title="Error per Fold", template='plotly_white')
+    st.plotly_chart(fig, use_container_width=True)
+    display_folds = folds.copy()
+    for column in ('train_start', 'test_start', 'test_end'):
+        display_folds[column] = pd.to_datetime(display_folds[column]).dt.strftime('%Y-%m-%d')
+    st.dataframe(display_folds.round(4), use_container_width=True, hide_index=True)
+
 def display_data_table(df, ticker):
     st.markdown("### 📋 Historical Data")
     display_df = df.tail(50).copy()
@@ -545,6 +620,9 @@ def display_data_table(df, ticker):
     if 'RSI' in display_df.columns:
         display_columns.append('RSI')
     display_df = display_df[display_columns]
+    # Compact frames hold float32 columns; show them at 2 decimals instead of their binary expansion
+    float32_columns = display_df.select_dtypes('float32').columns
+    display_df[float32_columns] = display_df[float32_columns].astype('float64').round(2)
     st.dataframe(display_df, use_container_width=True)
     csv = df.to_csv(index=False)
     st.download_button(
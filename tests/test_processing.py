@@ -0,0 +1,61 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from modules import processing
+
+
+def _ohlcv(n=600, seed=7, cents=True, scale=150.0):
+    rng = np.random.default_rng(seed)
+    close = scale * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    if cents:
+        close = np.round(close, 2)
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    frame = pd.DataFrame({
+        'Date': pd.bdate_range('2020-01-01', periods=n),
+        'Open': close + rng.normal(0, 0.005, n) * close,
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.integers(10_000, 5_000_000, n).astype(np.float64),
+    })
+    if cents:
+        frame[['Open', 'High', 'Low']] = frame[['Open', 'High', 'Low']].round(2)
+    return frame
+
+
+def _processed(df, compact, monkeypatch):
+    monkeypatch.setattr(config, 'COMPACT_FRAMES', compact)
+    processing._INDICATOR_MEMO.clear()
+    return processing.process_stock_data(df, f"TEST_{compact}", 'test', processing.INDICATOR_COLUMNS + processing.EXTENDED_INDICATORS)
+
+
+@pytest.mark.parametrize('cents, scale', [(True, 150.0), (False, 150.0), (True, 80_000.0)])
+def test_compact_frame_keeps_two_decimal_values(cents, scale, monkeypatch):
+    df = _ohlcv(cents=cents, scale=scale)
+    full = _processed(df, False, monkeypatch)
+    compact = _processed(df, True, monkeypatch)
+
+    assert list(compact.columns) == list(full.columns)
+    for col in full.columns:
+        if col == 'Date':
+            continue
+        expected = [f"{v:.2f}" for v in full[col].to_numpy(dtype=np.float64)]
+        actual = [f"{v:.2f}" for v in compact[col].to_numpy(dtype=np.float64)]
+        assert actual == expected, col
+
+
+def test_compact_frame_narrows_cent_prices_only(monkeypatch):
+    compact = _processed(_ohlcv(cents=True), True, monkeypatch)
+    assert compact['Close'].dtype == np.float32
+    assert compact['Volume'].dtype == np.int32
+    assert compact['RSI'].dtype == np.float64
+    assert np.shares_memory(compact['Close'].to_numpy(), compact['Close_Lag_1'].to_numpy())
+
+    compact = _processed(_ohlcv(cents=False), True, monkeypatch)
+    assert compact['Close'].dtype == np.float64